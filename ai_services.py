@@ -1,247 +1,794 @@
-import os
-import re
-from typing import Dict, Any, List, Optional
-
-
-def _split_sentences(text: str) -> List[str]:
-    text = re.sub(r"\s+", " ", text.strip())
-    # Simple split on punctuation; keep it robust without external libs
-    sentences = re.split(r"(?<=[.!?])\s+", text)
-    # Filter short fragments
-    sentences = [s.strip() for s in sentences if len(s.strip()) > 0]
-    return sentences
-
-
-_STOPWORDS = set(
-    "a an the and or but if while with without within on in at for of to from by into over under about as is are was were be been being this that these those it its it's their there here such using use used than then when where which who whom whose what why how can may might should would could our we you your they them do does did done not no yes also more most much many few several each per via among between across against above below before after during until unless until because therefore however moreover nonetheless otherwise instead".split()
-)
-
-
-def _tokenize(text: str) -> List[str]:
-    tokens = re.findall(r"[A-Za-z][A-Za-z\-']+", text.lower())
-    return [t for t in tokens if t not in _STOPWORDS]
-
-
-def _score_sentences(sentences: List[str]) -> List[float]:
-    # Frequency-based extractive scoring
-    all_tokens: List[str] = []
-    for s in sentences:
-        all_tokens.extend(_tokenize(s))
-    freq: Dict[str, int] = {}
-    for t in all_tokens:
-        freq[t] = freq.get(t, 0) + 1
-    if not freq:
-        return [0.0] * len(sentences)
-    max_f = max(freq.values())
-    scores: List[float] = []
-    for s in sentences:
-        tokens = _tokenize(s)
-        if not tokens:
-            scores.append(0.0)
-            continue
-        score = sum(freq.get(t, 0) for t in tokens) / (len(tokens) * max_f)
-        scores.append(score)
-    return scores
-
-
-def _simplify_eli5(text: str) -> str:
-    replacements = {
-        "utilize": "use",
-        "approximately": "about",
-        "methodology": "method",
-        "optimization": "improving",
-        "architecture": "design",
-        "parameters": "settings",
-        "algorithm": "set of steps",
-        "demonstrate": "show",
-        "significant": "big",
-        "objective": "goal",
-        "hypothesis": "idea",
-        "complex": "hard",
-        "simplify": "make easier",
-        "evaluation": "testing",
-        "robust": "reliable",
-    }
-    out = text
-    for k, v in replacements.items():
-        out = re.sub(rf"\b{k}\b", v, out, flags=re.IGNORECASE)
-    # Shorten long sentences
-    sentences = _split_sentences(out)
-    clipped = []
-    for s in sentences:
-        if len(s) > 220:
-            s = s[:200].rstrip() + "..."
-        clipped.append(s)
-    return " ".join(clipped)
-
-
-def offline_summarize(text: str, max_sentences: int = 5, eli5: bool = False) -> Dict[str, Any]:
-    sentences = _split_sentences(text)
-    if not sentences:
-        return {"summary": text.strip(), "key_insights": [], "bullets": []}
-    scores = _score_sentences(sentences)
-    # Pick top sentences while preserving order
-    idx_sorted = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)[:max_sentences]
-    idx_sorted = sorted(idx_sorted)
-    chosen = [sentences[i] for i in idx_sorted]
-    summary = " ".join(chosen)
-    # Extract rough "insights" via keyword hints or top sentences
-    insight_hints = ("we ", "our ", "propos", "introduc", "method", "result", "outperform", "improv")
-    insights = [s for s in sentences if any(h in s.lower() for h in insight_hints)]
-    if not insights:
-        insights = chosen
-    bullets = [s if len(s) <= 220 else s[:200].rstrip() + "..." for s in insights[:5]]
-    if eli5:
-        summary = _simplify_eli5(summary)
-        bullets = [_simplify_eli5(b) for b in bullets]
-    return {"summary": summary, "key_insights": bullets, "bullets": bullets}
-
-
-def offline_chat(context: str, question: str, eli5: bool = False) -> str:
-    # Very naive retrieval: pick sentences with highest keyword overlap
-    sents = _split_sentences(context)
-    q_tokens = set(_tokenize(question))
-    if not sents:
-        base = "I don't have enough information to answer."
-        return _simplify_eli5(base) if eli5 else base
-    scored = []
-    for s in sents:
-        s_tokens = set(_tokenize(s))
-        overlap = len(q_tokens & s_tokens)
-        scored.append((overlap, s))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    top = [s for _, s in scored[:3] if _ > 0]
-    if not top:
-        answer = "Based on the abstract, I cannot find a direct answer. The paper discusses: " + " ".join(sents[:2])
-    else:
-        answer = "Here is what the paper says: " + " ".join(top)
-    return _simplify_eli5(answer) if eli5 else answer
-
-
-def _call_openai(messages: List[Dict[str, str]], model: str = "gpt-4o-mini") -> Optional[str]:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return None
-    try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        resp = client.chat.completions.create(model=model, messages=messages, temperature=0.2)
-        return resp.choices[0].message.content
-    except Exception:
-        return None
-
-
-def _call_groq(messages: List[Dict[str, str]], model: str = "llama-3.1-70b-versatile") -> Optional[str]:
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        return None
-    try:
-        from groq import Groq
-        client = Groq(api_key=api_key)
-        resp = client.chat.completions.create(model=model, messages=messages, temperature=0.2)
-        return resp.choices[0].message.content
-    except Exception:
-        return None
-
-
-def _call_anthropic(messages: List[Dict[str, str]], model: str = "claude-3-5-haiku-latest") -> Optional[str]:
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        return None
-    try:
-        import anthropic
-        client = anthropic.Anthropic(api_key=api_key)
-        # Convert OpenAI-like messages to Anthropic prompt
-        sys = ""
-        user_parts = []
-        for m in messages:
-            if m["role"] == "system":
-                sys = m["content"]
-            elif m["role"] == "user":
-                user_parts.append(m["content"])
-            elif m["role"] == "assistant":
-                user_parts.append("Assistant: " + m["content"])  # context only
-        content = "\n\n".join(user_parts)
-        resp = client.messages.create(
-            model=model,
-            max_tokens=800,
-            temperature=0.2,
-            system=sys or "You are a helpful assistant.",
-            messages=[{"role": "user", "content": content}],
-        )
-        # Anthropics returns content parts
-        if resp.content and len(resp.content) > 0:
-            return getattr(resp.content[0], "text", None) or str(resp.content[0])
-        return None
-    except Exception:
-        return None
-
-
-def _call_gemini(messages: List[Dict[str, str]], model: str = "gemini-1.5-flash") -> Optional[str]:
-    api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GOOGLE_GENERATIVE_AI_API_KEY")
-    if not api_key:
-        return None
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        sys = ""
-        user_content = []
-        for m in messages:
-            if m["role"] == "system":
-                sys = m["content"]
-            elif m["role"] == "user":
-                user_content.append(m["content"])
-        prompt = (sys + "\n\n" + "\n\n".join(user_content)).strip()
-        model_obj = genai.GenerativeModel(model)
-        resp = model_obj.generate_content(prompt)
-        return getattr(resp, "text", None)
-    except Exception:
-        return None
-
-
-def llm_generate(provider: str, messages: List[Dict[str, str]]) -> Optional[str]:
-    provider = (provider or "").lower()
-    if provider == "openai":
-        return _call_openai(messages)
-    if provider == "groq":
-        return _call_groq(messages)
-    if provider == "anthropic":
-        return _call_anthropic(messages)
-    if provider == "gemini":
-        return _call_gemini(messages)
-    return None
-
-
-def ai_summarize(text: str, mode: str = "default", provider: str = "offline") -> Dict[str, Any]:
-    eli5 = mode.lower() == "eli5"
-    # Try LLM first if provider given; otherwise offline
-    sys = "You summarize scientific papers clearly and concisely. Also extract 3-5 key insights as bullets."
-    if eli5:
-        sys += " Explain like I'm five without losing the main ideas."
-    user = f"Summarize the following scientific abstract or excerpt in 6-8 sentences. Then list 3-5 key insights as bullets.\n\nTEXT:\n{text}"
-    llm_out = llm_generate(provider, [{"role": "system", "content": sys}, {"role": "user", "content": user}])
-    if llm_out:
-        # Heuristic split: summary first paragraph, bullets afterwards
-        parts = llm_out.strip().split("\n\n")
-        summary = parts[0].strip()
-        bullets = []
-        for line in llm_out.splitlines():
-            if line.strip().startswith(('-', '*', '•')):
-                bullets.append(line.strip('-*• ').strip())
-        if not bullets:
-            bullets = [p.strip() for p in parts[1:3] if p.strip()]
-        return {"summary": summary, "key_insights": bullets[:5], "bullets": bullets[:5]}
-    # Offline fallback
-    return offline_summarize(text, max_sentences=5, eli5=eli5)
-
-
-def ai_chat(context: str, question: str, mode: str = "default", provider: str = "offline", history: Optional[List[Dict[str, str]]] = None) -> str:
-    eli5 = mode.lower() == "eli5"
-    messages = [{"role": "system", "content": "Answer questions using the given paper context. If unsure, say so."}]
-    if history:
-        messages.extend(history)
-    messages.append({"role": "user", "content": f"Context:\n{context}\n\nQuestion: {question}"})
-    llm_out = llm_generate(provider, messages)
-    if llm_out:
-        return llm_out
-    return offline_chat(context, question, eli5=eli5)
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from cache import TTLCache
+
+
+_STOPWORDS = set(
+    "a an the and or but if while with without within on in at for of to from by into over under about as is are was were be been being this that these those it its it's their there here such using use used than then when where which who whom whose what why how can may might should would could our we you your they them do does did done not no yes also more most much many few several each per via among between across against above below before after during until unless until because therefore however moreover nonetheless otherwise instead".split()
+)
+
+_ELI5_REPLACEMENTS = {
+    "utilize": "use",
+    "approximately": "about",
+    "methodology": "method",
+    "optimization": "improving",
+    "architecture": "design",
+    "parameters": "settings",
+    "algorithm": "set of steps",
+    "demonstrate": "show",
+    "significant": "big",
+    "objective": "goal",
+    "hypothesis": "idea",
+    "complex": "hard",
+    "simplify": "make easier",
+    "evaluation": "testing",
+    "robust": "reliable",
+}
+
+
+class TextPipeline:
+    """Sentence splitting, tokenization and ELI5 rewriting with patterns compiled once."""
+
+    def __init__(self, stopwords=None, replacements=None):
+        self.stopwords = frozenset(_STOPWORDS if stopwords is None else stopwords)
+        replacements = _ELI5_REPLACEMENTS if replacements is None else replacements
+        self._replacements = {k.lower(): v for k, v in replacements.items()}
+        self._ws = re.compile(r"\s+")
+        self._sentence_break = re.compile(r"(?<=[.!?])\s+")
+        self._token = re.compile(r"[A-Za-z][A-Za-z\-']+")
+        # One alternation for every replacement word; longest first so prefixes can't shadow
+        words = sorted(self._replacements, key=len, reverse=True)
+        self._eli5 = re.compile(r"\b(?:" + "|".join(map(re.escape, words)) + r")\b", re.IGNORECASE)
+
+    def split_sentences(self, text: str) -> List[str]:
+        text = self._ws.sub(" ", text.strip())
+        # Simple split on punctuation; keep it robust without external libs
+        return [s.strip() for s in self._sentence_break.split(text) if s.strip()]
+
+    def tokenize(self, text: str) -> List[str]:
+        stop = self.stopwords
+        return [t for t in self._token.findall(text.lower()) if t not in stop]
+
+    def analyze(self, text: str) -> Tuple[List[str], List[List[str]]]:
+        """Split into sentences and tokenize each one, in a single pass over the text."""
+        sentences = self.split_sentences(text)
+        return sentences, [self.tokenize(s) for s in sentences]
+
+    def simplify_eli5(self, text: str) -> str:
+        out = self._eli5.sub(lambda m: self._replacements[m.group(0).lower()], text)
+        # Shorten long sentences
+        clipped = []
+        for s in self.split_sentences(out):
+            if len(s) > 220:
+                s = s[:200].rstrip() + "..."
+            clipped.append(s)
+        return " ".join(clipped)
+
+
+_PIPELINE = TextPipeline()
+
+
+def _split_sentences(text: str) -> List[str]:
+    return _PIPELINE.split_sentences(text)
+
+
+def _tokenize(text: str) -> List[str]:
+    return _PIPELINE.tokenize(text)
+
+
+def _simplify_eli5(text: str) -> str:
+    return _PIPELINE.simplify_eli5(text)
+
+
+def _score_sentences(sentence_tokens: List[List[str]]) -> List[float]:
+    # Frequency-based extractive scoring over pre-tokenized sentences
+    freq: Dict[str, int] = {}
+    for tokens in sentence_tokens:
+        for t in tokens:
+            freq[t] = freq.get(t, 0) + 1
+    if not freq:
+        return [0.0] * len(sentence_tokens)
+    max_f = max(freq.values())
+    scores: List[float] = []
+    for tokens in sentence_tokens:
+        if not tokens:
+            scores.append(0.0)
+            continue
+        score = sum(freq[t] for t in tokens) / (len(tokens) * max_f)
+        scores.append(score)
+    return scores
+
+
+def _assemble_summary(text: str, sentences: List[str], scores: List[float], max_sentences: int, eli5: bool) -> Dict[str, Any]:
+    if not sentences:
+        return {"summary": text.strip(), "key_insights": [], "bullets": []}
+    # Pick top sentences while preserving order
+    idx_sorted = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)[:max_sentences]
+    idx_sorted = sorted(idx_sorted)
+    chosen = [sentences[i] for i in idx_sorted]
+    summary = " ".join(chosen)
+    # Extract rough "insights" via keyword hints or top sentences
+    insight_hints = ("we ", "our ", "propos", "introduc", "method", "result", "outperform", "improv")
+    insights = [s for s in sentences if any(h in s.lower() for h in insight_hints)]
+    if not insights:
+        insights = chosen
+    bullets = [s if len(s) <= 220 else s[:200].rstrip() + "..." for s in insights[:5]]
+    if eli5:
+        summary = _simplify_eli5(summary)
+        bullets = [_simplify_eli5(b) for b in bullets]
+    return {"summary": summary, "key_insights": bullets, "bullets": bullets}
+
+
+def offline_summarize(text: str, max_sentences: int = 5, eli5: bool = False) -> Dict[str, Any]:
+    sentences, sentence_tokens = _PIPELINE.analyze(text)
+    scores = _score_sentences(sentence_tokens)
+    return _assemble_summary(text, sentences, scores, max_sentences, eli5)
+
+
+def batch_summarize(texts: List[str], max_sentences: int = 5, eli5: bool = False) -> List[Dict[str, Any]]:
+    """Offline-summarize many texts at once; same output as offline_summarize per text.
+
+    Every sentence is tokenized once into a sparse (sentence, term) occurrence
+    list; per-document term frequencies and all sentence scores are then
+    computed with a handful of NumPy operations across every document.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [offline_summarize(t, max_sentences=max_sentences, eli5=eli5) for t in texts]
+
+    doc_sentences: List[List[str]] = []
+    vocab: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    sent_doc: List[int] = []
+    for d, text in enumerate(texts):
+        sentences, sentence_tokens = _PIPELINE.analyze(text)
+        doc_sentences.append(sentences)
+        for tokens in sentence_tokens:
+            row = len(sent_doc)
+            sent_doc.append(d)
+            for t in tokens:
+                rows.append(row)
+                cols.append(vocab.setdefault(t, len(vocab)))
+    n_sent = len(sent_doc)
+    if not rows:
+        return [_assemble_summary(t, ss, [0.0] * len(ss), max_sentences, eli5) for t, ss in zip(texts, doc_sentences)]
+
+    rows_arr = np.asarray(rows, dtype=np.int64)
+    sent_doc_arr = np.asarray(sent_doc, dtype=np.int64)
+    # Sparse document x term counts: one key per (doc, term) pair present
+    doc_term = sent_doc_arr[rows_arr] * len(vocab) + np.asarray(cols, dtype=np.int64)
+    keys, inverse, counts = np.unique(doc_term, return_inverse=True, return_counts=True)
+    max_f = np.zeros(len(texts))
+    np.maximum.at(max_f, keys // len(vocab), counts)
+    # Each token occurrence contributes its document frequency to its sentence
+    weighted = np.bincount(rows_arr, weights=counts[inverse], minlength=n_sent)
+    lengths = np.bincount(rows_arr, minlength=n_sent)
+    denom = lengths * max_f[sent_doc_arr]
+    scores = np.divide(weighted, denom, out=np.zeros(n_sent), where=denom > 0)
+
+    results = []
+    offset = 0
+    for text, sentences in zip(texts, doc_sentences):
+        doc_scores = scores[offset:offset + len(sentences)].tolist()
+        offset += len(sentences)
+        results.append(_assemble_summary(text, sentences, doc_scores, max_sentences, eli5))
+    return results
+
+
+class ContextIndex:
+    """BM25 sentence index over one chat context, built once and reused every turn."""
+
+    def __init__(self, context: str, k1: float = 1.2, b: float = 0.75):
+        self.sentences, sentence_tokens = _PIPELINE.analyze(context)
+        self.k1 = k1
+        self.b = b
+        self._lengths = [len(t) for t in sentence_tokens]
+        self._avg_len = max(sum(self._lengths) / len(self._lengths), 1.0) if self._lengths else 1.0
+        # term -> [(sentence index, term frequency)]
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        for i, tokens in enumerate(sentence_tokens):
+            for term, tf in Counter(tokens).items():
+                self._postings.setdefault(term, []).append((i, tf))
+        n = len(self.sentences)
+        self._idf = {t: math.log(1.0 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self._postings.items()}
+
+    def top_k(self, question: str, k: int = 3) -> List[str]:
+        """Best-scoring sentences (score > 0), best first; ties keep document order."""
+        scores: Dict[int, float] = {}
+        for term in set(_PIPELINE.tokenize(question)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / self._avg_len)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        best = heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1], -kv[0]))
+        return [self.sentences[i] for i, score in best if score > 0]
+
+
+# Multi-turn chats hit the same context repeatedly; keyed by content hash
+_context_indexes = TTLCache(max_entries=128, ttl=3600.0)
+
+
+def _context_index(context: str) -> ContextIndex:
+    key = hashlib.sha1(context.encode("utf-8")).hexdigest()
+    index = _context_indexes.get(key)
+    if index is None:
+        index = ContextIndex(context)
+        _context_indexes.set(key, index)
+    return index
+
+
+def offline_chat(context: str, question: str, eli5: bool = False) -> str:
+    # Retrieval: BM25-rank the context's sentences against the question
+    index = _context_index(context)
+    sents = index.sentences
+    if not sents:
+        base = "I don't have enough information to answer."
+        return _simplify_eli5(base) if eli5 else base
+    top = index.top_k(question, k=3)
+    if not top:
+        answer = "Based on the abstract, I cannot find a direct answer. The paper discusses: " + " ".join(sents[:2])
+    else:
+        answer = "Here is what the paper says: " + " ".join(top)
+    return _simplify_eli5(answer) if eli5 else answer
+
+
+_PROVIDER_ENV_KEYS = {
+    "openai": ("OPENAI_API_KEY",),
+    "groq": ("GROQ_API_KEY",),
+    "anthropic": ("ANTHROPIC_API_KEY",),
+    "gemini": ("GOOGLE_API_KEY", "GOOGLE_GENERATIVE_AI_API_KEY"),
+}
+
+DEFAULT_MODELS = {
+    "openai": "gpt-4o-mini",
+    "groq": "llama-3.1-70b-versatile",
+    "anthropic": "claude-3-5-haiku-latest",
+    "gemini": "gemini-1.5-flash",
+}
+
+
+def _provider_timeout(provider: str) -> float:
+    return float(os.getenv(f"LLM_TIMEOUT_{provider.upper()}") or os.getenv("LLM_TIMEOUT") or "30")
+
+
+def _provider_api_key(provider: str) -> Optional[str]:
+    for name in _PROVIDER_ENV_KEYS.get(provider, ()):
+        value = os.getenv(name)
+        if value:
+            return value
+    return None
+
+
+class _GeminiClient:
+    # genai.configure is process-global, so do it once and reuse model objects
+    def __init__(self, api_key: str):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def model(self, name: str):
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self._genai.GenerativeModel(name)
+            return self._models[name]
+
+
+class ProviderRegistry:
+    """One long-lived SDK client per (provider, API key), created on first use.
+
+    The OpenAI, Groq and Anthropic clients are thread-safe and keep a pooled
+    keep-alive HTTP connection, so reusing them avoids import, TLS and setup
+    cost on every request.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def _create(self, provider: str, api_key: str) -> Any:
+        if provider == "openai":
+            from openai import OpenAI
+            return OpenAI(api_key=api_key, timeout=_provider_timeout(provider))
+        if provider == "groq":
+            from groq import Groq
+            return Groq(api_key=api_key, timeout=_provider_timeout(provider))
+        if provider == "anthropic":
+            import anthropic
+            return anthropic.Anthropic(api_key=api_key, timeout=_provider_timeout(provider))
+        if provider == "gemini":
+            return _GeminiClient(api_key)
+        raise ValueError(f"Unknown provider: {provider}")
+
+    def get(self, provider: str) -> Optional[Any]:
+        api_key = _provider_api_key(provider)
+        if not api_key:
+            return None
+        key = (provider, api_key)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._create(provider, api_key)
+                    self._clients[key] = client
+        return client
+
+    def warm_up(self) -> Dict[str, bool]:
+        """Create clients for every provider with a configured key. Returns provider -> ready."""
+        status = {}
+        for provider in _PROVIDER_ENV_KEYS:
+            if not _provider_api_key(provider):
+                continue
+            try:
+                status[provider] = self.get(provider) is not None
+            except Exception:
+                status[provider] = False
+        return status
+
+
+provider_registry = ProviderRegistry()
+
+
+def _call_openai(messages: List[Dict[str, str]], model: str = DEFAULT_MODELS["openai"]) -> Optional[str]:
+    try:
+        client = provider_registry.get("openai")
+        if client is None:
+            return None
+        resp = client.chat.completions.create(model=model, messages=messages, temperature=0.2)
+        return resp.choices[0].message.content
+    except Exception:
+        return None
+
+
+def _call_groq(messages: List[Dict[str, str]], model: str = DEFAULT_MODELS["groq"]) -> Optional[str]:
+    try:
+        client = provider_registry.get("groq")
+        if client is None:
+            return None
+        resp = client.chat.completions.create(model=model, messages=messages, temperature=0.2)
+        return resp.choices[0].message.content
+    except Exception:
+        return None
+
+
+def _anthropic_prompt(messages: List[Dict[str, str]]) -> Tuple[str, str]:
+    # Convert OpenAI-like messages to Anthropic prompt
+    sys = ""
+    user_parts = []
+    for m in messages:
+        if m["role"] == "system":
+            sys = m["content"]
+        elif m["role"] == "user":
+            user_parts.append(m["content"])
+        elif m["role"] == "assistant":
+            user_parts.append("Assistant: " + m["content"])  # context only
+    return sys, "\n\n".join(user_parts)
+
+
+def _gemini_prompt(messages: List[Dict[str, str]]) -> str:
+    sys = ""
+    user_content = []
+    for m in messages:
+        if m["role"] == "system":
+            sys = m["content"]
+        elif m["role"] == "user":
+            user_content.append(m["content"])
+    return (sys + "\n\n" + "\n\n".join(user_content)).strip()
+
+
+def _call_anthropic(messages: List[Dict[str, str]], model: str = DEFAULT_MODELS["anthropic"]) -> Optional[str]:
+    try:
+        client = provider_registry.get("anthropic")
+        if client is None:
+            return None
+        sys, content = _anthropic_prompt(messages)
+        resp = client.messages.create(
+            model=model,
+            max_tokens=800,
+            temperature=0.2,
+            system=sys or "You are a helpful assistant.",
+            messages=[{"role": "user", "content": content}],
+        )
+        # Anthropics returns content parts
+        if resp.content and len(resp.content) > 0:
+            return getattr(resp.content[0], "text", None) or str(resp.content[0])
+        return None
+    except Exception:
+        return None
+
+
+def _call_gemini(messages: List[Dict[str, str]], model: str = DEFAULT_MODELS["gemini"]) -> Optional[str]:
+    try:
+        client = provider_registry.get("gemini")
+        if client is None:
+            return None
+        resp = client.model(model).generate_content(_gemini_prompt(messages))
+        return getattr(resp, "text", None)
+    except Exception:
+        return None
+
+
+# Streaming adapters: yield text deltas as the provider produces them. They raise
+# on failure; llm_stream decides whether a fallback is still possible.
+def _stream_openai_compatible(provider: str, messages: List[Dict[str, str]]) -> Iterator[str]:
+    client = provider_registry.get(provider)
+    if client is None:
+        return
+    stream = client.chat.completions.create(model=DEFAULT_MODELS[provider], messages=messages, temperature=0.2, stream=True)
+    for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+def _stream_openai(messages: List[Dict[str, str]]) -> Iterator[str]:
+    return _stream_openai_compatible("openai", messages)
+
+
+def _stream_groq(messages: List[Dict[str, str]]) -> Iterator[str]:
+    return _stream_openai_compatible("groq", messages)
+
+
+def _stream_anthropic(messages: List[Dict[str, str]]) -> Iterator[str]:
+    client = provider_registry.get("anthropic")
+    if client is None:
+        return
+    sys, content = _anthropic_prompt(messages)
+    with client.messages.stream(
+        model=DEFAULT_MODELS["anthropic"],
+        max_tokens=800,
+        temperature=0.2,
+        system=sys or "You are a helpful assistant.",
+        messages=[{"role": "user", "content": content}],
+    ) as stream:
+        for text in stream.text_stream:
+            if text:
+                yield text
+
+
+def _stream_gemini(messages: List[Dict[str, str]]) -> Iterator[str]:
+    client = provider_registry.get("gemini")
+    if client is None:
+        return
+    for chunk in client.model(DEFAULT_MODELS["gemini"]).generate_content(_gemini_prompt(messages), stream=True):
+        text = getattr(chunk, "text", None)
+        if text:
+            yield text
+
+
+_STREAMERS = {
+    "openai": _stream_openai,
+    "groq": _stream_groq,
+    "anthropic": _stream_anthropic,
+    "gemini": _stream_gemini,
+}
+
+
+_CALLERS = {
+    "openai": _call_openai,
+    "groq": _call_groq,
+    "anthropic": _call_anthropic,
+    "gemini": _call_gemini,
+}
+
+
+class LatencyHistogram:
+    """Per-provider latency histogram (non-cumulative buckets) plus outcome counters.
+
+    Latencies are always the call's real duration; a call the caller stopped
+    waiting for is counted under "timeout" and still lands in its bucket when it ends.
+    """
+
+    BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Any]] = {}
+
+    def _entry(self, provider: str) -> Dict[str, Any]:
+        return self._data.setdefault(provider, {
+            "buckets": [0] * len(self.BUCKETS), "count": 0, "sum_s": 0.0, "ok": 0, "empty": 0, "timeout": 0,
+        })
+
+    def record_timeout(self, provider: str) -> None:
+        with self._lock:
+            self._entry(provider)["timeout"] += 1
+
+    def record(self, provider: str, seconds: float, outcome: str) -> None:
+        with self._lock:
+            d = self._entry(provider)
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    d["buckets"][i] += 1
+                    break
+            d["count"] += 1
+            d["sum_s"] += seconds
+            d[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = ["le_" + ("inf" if b == float("inf") else str(b)) for b in self.BUCKETS]
+        with self._lock:
+            return {
+                p: {**{k: v for k, v in d.items() if k != "buckets"}, "buckets": dict(zip(labels, d["buckets"]))}
+                for p, d in self._data.items()
+            }
+
+
+llm_latency = LatencyHistogram()
+# Shared workers for timed/raced provider calls; SDK timeouts bound how long a loser keeps one busy
+_llm_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm")
+
+
+def _timed_call(provider: str, messages: List[Dict[str, str]]) -> Optional[str]:
+    start = time.perf_counter()
+    out = _CALLERS[provider](messages)
+    llm_latency.record(provider, time.perf_counter() - start, "ok" if out else "empty")
+    return out
+
+
+def _provider_chain(provider: str) -> List[str]:
+    """Requested provider first, then the configured chain, keeping only providers with a key."""
+    chain = [provider] + [p.strip().lower() for p in os.getenv("LLM_FALLBACK_CHAIN", "openai,groq,anthropic,gemini").split(",")]
+    seen: List[str] = []
+    for p in chain:
+        if p in _CALLERS and p not in seen and _provider_api_key(p):
+            seen.append(p)
+    return seen
+
+
+def _generate_fallback(chain: List[str], messages: List[Dict[str, str]]) -> Tuple[Optional[str], Optional[str]]:
+    for provider in chain:
+        timeout = _provider_timeout(provider)
+        future = _llm_pool.submit(_timed_call, provider, messages)
+        try:
+            out = future.result(timeout=timeout)
+        except FutureTimeout:
+            llm_latency.record_timeout(provider)
+            continue
+        if out:
+            return out, provider
+    return None, None
+
+
+def _generate_race(chain: List[str], messages: List[Dict[str, str]], width: int) -> Tuple[Optional[str], Optional[str]]:
+    racers = chain[:max(1, width)]
+    if not racers:
+        # No provider has a key configured: the caller falls back to the offline answer
+        return None, None
+    pending = {_llm_pool.submit(_timed_call, p, messages): p for p in racers}
+    deadline = time.monotonic() + max(_provider_timeout(p) for p in racers)
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = pending.pop(future)
+                out = future.result()
+                if out:
+                    return out, provider
+        for provider in pending.values():
+            llm_latency.record_timeout(provider)
+    finally:
+        # Losers: drop queued calls; running ones finish in the background within their SDK timeout
+        for future in pending:
+            future.cancel()
+    # Every racer failed: walk the rest of the chain in order
+    return _generate_fallback(chain[len(racers):], messages)
+
+
+def llm_generate(provider: str, messages: List[Dict[str, str]]) -> Optional[str]:
+    """Generate with the configured strategy (LLM_STRATEGY):
+
+    - single (default): only the requested provider
+    - fallback: requested provider, then LLM_FALLBACK_CHAIN in order, each with its LLM_TIMEOUT[_<PROVIDER>]
+    - race: the first LLM_RACE_WIDTH providers of that chain concurrently; first valid answer wins
+    """
+    return _generate(provider, messages)[0]
+
+
+def _generate(provider: str, messages: List[Dict[str, str]]) -> Tuple[Optional[str], Optional[str]]:
+    """llm_generate, plus the provider that actually answered (None if none did)."""
+    provider = (provider or "").lower()
+    if provider not in _CALLERS:
+        return None, None
+    strategy = os.getenv("LLM_STRATEGY", "single").lower()
+    if strategy == "fallback":
+        return _generate_fallback(_provider_chain(provider), messages)
+    if strategy == "race":
+        return _generate_race(_provider_chain(provider), messages, int(os.getenv("LLM_RACE_WIDTH", "2")))
+    out = _timed_call(provider, messages)
+    return out, provider if out else None
+
+
+def llm_stream(provider: str, messages: List[Dict[str, str]]) -> Iterator[str]:
+    """Stream text deltas from a provider; yields nothing if no provider could answer.
+
+    With LLM_STRATEGY=fallback or race, providers later in the chain are tried
+    until one produces a first token (streams are not raced). Once tokens have
+    been sent, a mid-stream failure just ends the stream.
+    """
+    for _, delta in _stream(provider, messages):
+        yield delta
+
+
+def _stream(provider: str, messages: List[Dict[str, str]]) -> Iterator[Tuple[str, str]]:
+    """llm_stream as (answering provider, delta) pairs."""
+    provider = (provider or "").lower()
+    if provider not in _STREAMERS:
+        return
+    strategy = os.getenv("LLM_STRATEGY", "single").lower()
+    chain = _provider_chain(provider) if strategy in ("fallback", "race") else [provider]
+    for p in chain:
+        start = time.perf_counter()
+        started = False
+        try:
+            for delta in _STREAMERS[p](messages):
+                if not started:
+                    # Time to first token is the latency that matters for streams
+                    llm_latency.record(p, time.perf_counter() - start, "ok")
+                    started = True
+                yield p, delta
+        except Exception:
+            if started:
+                return
+        if started:
+            return
+        llm_latency.record(p, time.perf_counter() - start, "empty")
+
+
+# Bump when the summarize prompt or output shaping changes, to invalidate cached results
+SUMMARY_PROMPT_VERSION = "1"
+
+summary_cache = TTLCache(
+    max_entries=int(os.getenv("SUMMARY_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("SUMMARY_CACHE_TTL", str(7 * 24 * 3600))),
+    path=os.getenv("SUMMARY_CACHE_PATH", "summary_cache.db") or None,
+    max_bytes=int(os.getenv("SUMMARY_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+    max_disk_bytes=int(os.getenv("SUMMARY_CACHE_MAX_DISK_BYTES", str(256 * 1024 * 1024))),
+)
+
+
+def _summarize_messages(text: str, eli5: bool) -> List[Dict[str, str]]:
+    sys = "You summarize scientific papers clearly and concisely. Also extract 3-5 key insights as bullets."
+    if eli5:
+        sys += " Explain like I'm five without losing the main ideas."
+    user = f"Summarize the following scientific abstract or excerpt in 6-8 sentences. Then list 3-5 key insights as bullets.\n\nTEXT:\n{text}"
+    return [{"role": "system", "content": sys}, {"role": "user", "content": user}]
+
+
+def _llm_summarize(text: str, eli5: bool, provider: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Parsed LLM summary and the provider that wrote it, or (None, None)."""
+    llm_out, answered_by = _generate(provider, _summarize_messages(text, eli5))
+    if not llm_out:
+        return None, None
+    return _parse_llm_summary(llm_out), answered_by
+
+
+def _parse_llm_summary(llm_out: str) -> Dict[str, Any]:
+    # Heuristic split: summary first paragraph, bullets afterwards
+    parts = llm_out.strip().split("\n\n")
+    summary = parts[0].strip()
+    bullets = []
+    for line in llm_out.splitlines():
+        if line.strip().startswith(('-', '*', '•')):
+            bullets.append(line.strip('-*• ').strip())
+    if not bullets:
+        bullets = [p.strip() for p in parts[1:3] if p.strip()]
+    return {"summary": summary, "key_insights": bullets[:5], "bullets": bullets[:5]}
+
+
+def ai_summarize(text: str, mode: str = "default", provider: str = "offline") -> Dict[str, Any]:
+    eli5 = mode.lower() == "eli5"
+    # Try LLM first if provider given; otherwise offline
+    result, _ = _llm_summarize(text, eli5, provider)
+    if result:
+        return result
+    # Offline fallback
+    return offline_summarize(text, max_sentences=5, eli5=eli5)
+
+
+def _summary_cache_key(text: str, mode: str, provider: str) -> str:
+    model = DEFAULT_MODELS.get(provider, "extractive")
+    raw = json.dumps([text, mode, provider, model, SUMMARY_PROMPT_VERSION])
+    return "summary|" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def cached_summarize(text: str, mode: str = "default", provider: str = "offline") -> Tuple[Dict[str, Any], str]:
+    """ai_summarize behind summary_cache. Returns (result, cache status: HIT | MISS | BYPASS).
+
+    An offline fallback after a failed LLM call is returned but not cached
+    (BYPASS), so a provider outage doesn't pin degraded summaries. Neither is
+    an answer from another provider in the fallback/race chain: it is cached
+    under the provider that wrote it, not the one requested.
+    """
+    mode = (mode or "default").lower()
+    provider = (provider or "offline").lower()
+    key = _summary_cache_key(text, mode, provider)
+    cached = summary_cache.get(key)
+    if cached is not None:
+        return cached, "HIT"
+    eli5 = mode == "eli5"
+    result, answered_by = _llm_summarize(text, eli5, provider) if provider in DEFAULT_MODELS else (None, None)
+    if result is None:
+        result = offline_summarize(text, max_sentences=5, eli5=eli5)
+        if provider in DEFAULT_MODELS:
+            return result, "BYPASS"
+    elif answered_by != provider:
+        summary_cache.set(_summary_cache_key(text, mode, answered_by), result)
+        return result, "BYPASS"
+    summary_cache.set(key, result)
+    return result, "MISS"
+
+
+def ai_summarize_stream(text: str, mode: str = "default", provider: str = "offline") -> Iterator[Dict[str, Any]]:
+    """Streaming summarize: {"delta": str} events while the LLM writes, then {"done": True, "result": {...}}."""
+    mode = (mode or "default").lower()
+    provider = (provider or "offline").lower()
+    key = _summary_cache_key(text, mode, provider)
+    cached = summary_cache.get(key)
+    if cached is not None:
+        yield {"done": True, "result": cached, "cache": "HIT"}
+        return
+    eli5 = mode == "eli5"
+    parts: List[str] = []
+    answered_by = provider
+    for answered_by, delta in _stream(provider, _summarize_messages(text, eli5)):
+        parts.append(delta)
+        yield {"delta": delta}
+    if parts:
+        result = _parse_llm_summary("".join(parts))
+        summary_cache.set(_summary_cache_key(text, mode, answered_by), result)
+        yield {"done": True, "result": result, "cache": "MISS" if answered_by == provider else "BYPASS"}
+        return
+    result = offline_summarize(text, max_sentences=5, eli5=eli5)
+    status = "BYPASS" if provider in DEFAULT_MODELS else "MISS"
+    if status == "MISS":
+        summary_cache.set(key, result)
+    yield {"delta": result["summary"]}
+    yield {"done": True, "result": result, "cache": status}
+
+
+def _chat_messages(context: str, question: str, history: Optional[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    messages = [{"role": "system", "content": "Answer questions using the given paper context. If unsure, say so."}]
+    if history:
+        messages.extend(history)
+    messages.append({"role": "user", "content": f"Context:\n{context}\n\nQuestion: {question}"})
+    return messages
+
+
+def ai_chat(context: str, question: str, mode: str = "default", provider: str = "offline", history: Optional[List[Dict[str, str]]] = None) -> str:
+    eli5 = mode.lower() == "eli5"
+    llm_out = llm_generate(provider, _chat_messages(context, question, history))
+    if llm_out:
+        return llm_out
+    return offline_chat(context, question, eli5=eli5)
+
+
+def ai_chat_stream(context: str, question: str, mode: str = "default", provider: str = "offline", history: Optional[List[Dict[str, str]]] = None) -> Iterator[str]:
+    """Like ai_chat, but yields the answer as text deltas as soon as the provider emits them."""
+    eli5 = mode.lower() == "eli5"
+    streamed = False
+    for delta in llm_stream(provider, _chat_messages(context, question, history)):
+        streamed = True
+        yield delta
+    if not streamed:
+        yield offline_chat(context, question, eli5=eli5)
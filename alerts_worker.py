@@ -0,0 +1,204 @@
+"""
+Background refresher for topic alerts and followed authors.
+
+Runs as its own process, off the interactive path:
+
+    python alerts_worker.py                 # refresh every ALERTS_REFRESH_INTERVAL seconds
+    python alerts_worker.py --once          # single pass (cron friendly)
+
+Each watch (a topic or an author) keeps a high-water mark: the newest
+`published` timestamp seen so far. A refresh stores only entries past that
+mark, so `/alerts/new` can be served straight from SQLite without touching arXiv.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from arxiv_tool import ArxivQuery, search_arxiv_papers
+from identity import Deduper, paper_key
+from rate_limit import PRIORITY_BACKGROUND
+from store import ShardedStore, store
+
+KINDS = ("topic", "author")
+
+
+def _watch_filter(only: Optional[Iterable[Tuple[str, str]]]) -> Tuple[str, List[str]]:
+    """SQL condition (and parameters) matching rows of the given (kind, query) watches; None matches all."""
+    if only is None:
+        return "1", []
+    pairs = list(dict.fromkeys(only))
+    if not pairs:
+        return "0", []
+    return "(" + " OR ".join(["(kind = ? AND query = ?)"] * len(pairs)) + ")", [v for pair in pairs for v in pair]
+
+
+class AlertStore:
+    def __init__(self, path: str = "alerts.db"):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS watches (
+                    kind TEXT NOT NULL, query TEXT NOT NULL, last_published TEXT, checked REAL,
+                    PRIMARY KEY (kind, query)
+                );
+                CREATE TABLE IF NOT EXISTS new_entries (
+                    kind TEXT NOT NULL, query TEXT NOT NULL, doc_id TEXT NOT NULL,
+                    published TEXT, found REAL NOT NULL, data TEXT NOT NULL,
+                    PRIMARY KEY (kind, query, doc_id)
+                );
+                CREATE INDEX IF NOT EXISTS new_entries_found ON new_entries (found);
+                """
+            )
+            self._local.conn = conn
+        return conn
+
+    def watch(self, kind: str, query: str) -> bool:
+        """Start tracking a topic or author. Returns False if it was already watched."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown alert kind: {kind}")
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("INSERT OR IGNORE INTO watches (kind, query) VALUES (?, ?)", (kind, query.strip()))
+        return cur.rowcount == 1
+
+    def unwatch(self, kind: str, query: str) -> bool:
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("DELETE FROM watches WHERE kind = ? AND query = ?", (kind, query))
+            conn.execute("DELETE FROM new_entries WHERE kind = ? AND query = ?", (kind, query))
+        return cur.rowcount == 1
+
+    def watches(self, only: Optional[Iterable[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
+        """Every watch, or just the (kind, query) pairs in `only`."""
+        where, params = _watch_filter(only)
+        rows = self._conn().execute(
+            f"SELECT kind, query, last_published, checked FROM watches WHERE {where} ORDER BY kind, query", params
+        )
+        return [{"kind": k, "query": q, "last_published": lp, "checked": c} for k, q, lp, c in rows]
+
+    def record(self, kind: str, query: str, entries: List[Dict[str, Any]]) -> int:
+        """Store entries newer than the watch's high-water mark and advance it. Returns the count stored."""
+        conn = self._conn()
+        now = time.time()
+        stored = 0
+        with conn:
+            row = conn.execute(
+                "SELECT last_published FROM watches WHERE kind = ? AND query = ?", (kind, query)
+            ).fetchone()
+            mark = (row[0] if row else None) or ""
+            newest = mark
+            for entry in entries:
+                published = entry.get("published") or ""
+                doc_id = paper_key(entry)
+                # Same-second publications (and re-fetched versions) can straddle two refreshes; the primary key dedupes them
+                if not doc_id or published < mark:
+                    continue
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO new_entries (kind, query, doc_id, published, found, data) VALUES (?, ?, ?, ?, ?, ?)",
+                    (kind, query, doc_id, published or None, now, json.dumps(entry)),
+                )
+                stored += cur.rowcount
+                newest = max(newest, published)
+            conn.execute(
+                "UPDATE watches SET last_published = ?, checked = ? WHERE kind = ? AND query = ?",
+                (newest or None, now, kind, query),
+            )
+        return stored
+
+    def new_since(
+        self, since: float = 0.0, limit: int = 50, only: Optional[Iterable[Tuple[str, str]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Entries found after `since` (epoch seconds), newest first, one per paper.
+
+        `only` restricts the result to those (kind, query) watches, e.g. one
+        user's topics and authors. A paper several watches matched is listed
+        once: "alert" is the newest match and "matches" lists every watch seen.
+        """
+        where, params = _watch_filter(only)
+        rows = self._conn().execute(
+            f"SELECT kind, query, found, data FROM new_entries WHERE found > ? AND {where} ORDER BY found DESC, published DESC",
+            (since, *params),
+        )
+        papers = Deduper()
+        for k, q, found, data in rows:
+            entry = json.loads(data)
+            match = {"kind": k, "query": q, "found": found}
+            if papers.add(entry):
+                entry["alert"] = match
+                entry["matches"] = [match]
+                if len(papers) >= limit:
+                    break
+                continue
+            matches = papers.kept(entry)["matches"]
+            if not any(m["kind"] == k and m["query"] == q for m in matches):
+                matches.append(match)
+        return papers.entries
+
+    def last_checked(self, only: Optional[Iterable[Tuple[str, str]]] = None) -> Optional[float]:
+        where, params = _watch_filter(only)
+        return self._conn().execute(f"SELECT MAX(checked) FROM watches WHERE {where}", params).fetchone()[0]
+
+
+alert_store = AlertStore(os.getenv("ALERTS_DB_PATH", "alerts.db"))
+
+
+def sync_watches(alerts: AlertStore = alert_store, source: ShardedStore = store) -> int:
+    """Watch every topic/author any user has set in the store, and drop watches no user holds.
+
+    Returns how many were new.
+    """
+    held = {(w["kind"], w["query"]) for w in source.all_watches()}
+    for w in alerts.watches():
+        if (w["kind"], w["query"]) not in held:
+            alerts.unwatch(w["kind"], w["query"])
+    return sum(alerts.watch(kind, query) for kind, query in held)
+
+
+def _fetch(kind: str, query: str, max_results: int) -> List[Dict[str, Any]]:
+    # Authors are matched on the au: field, not full text that merely mentions the name
+    q = ArxivQuery(author=query) if kind == "author" else ArxivQuery(terms=query)
+    return search_arxiv_papers("", max_results=max_results, priority=PRIORITY_BACKGROUND, query=q).get("entries", [])
+
+
+def refresh_all(store: AlertStore = alert_store, max_results: int = 25) -> Dict[str, int]:
+    """One pass over every watch. Returns {"kind:query": new entry count}."""
+    results = {}
+    for w in store.watches():
+        label = f"{w['kind']}:{w['query']}"
+        try:
+            results[label] = store.record(w["kind"], w["query"], _fetch(w["kind"], w["query"], max_results))
+        except Exception as e:
+            print(f"Alert refresh failed for {label}: {e}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh topic/author alerts in the background")
+    parser.add_argument("--interval", type=float, default=float(os.getenv("ALERTS_REFRESH_INTERVAL", "3600")))
+    parser.add_argument("--max-results", type=int, default=25)
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args()
+
+    while True:
+        sync_watches()
+        t0 = time.time()
+        results = refresh_all(alert_store, max_results=args.max_results)
+        print(f"Refreshed {len(results)} alerts in {time.time() - t0:.1f}s, {sum(results.values())} new entries")
+        if args.once:
+            break
+        time.sleep(max(0.0, args.interval - (time.time() - t0)))
+
+
+if __name__ == "__main__":
+    main()
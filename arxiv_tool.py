@@ -1,108 +1,451 @@
-# Step1: Access arXiv using URL
-import requests
-
-
-def search_arxiv_papers(topic: str, max_results: int = 5) -> dict:
-    # Preserve boolean operators AND/OR/NOT in uppercase for arXiv queries
-    tokens = topic.strip().split()
-    norm = []
-    for t in tokens:
-        tl = t.lower()
-        if tl in {"and", "or", "not"}:
-            norm.append(t.upper())
-        else:
-            norm.append(t)
-    query = "+".join(norm)
-    for char in list('()"'):
-        if char in query:
-            print(f"Invalid character '{char}' in query: {query}")
-            raise ValueError(f"Cannot have character: '{char}' in query: {query}")
-    url = (
-            "http://export.arxiv.org/api/query"
-            f"?search_query=all:{query}"
-            f"&max_results={max_results}"
-            "&sortBy=submittedDate"
-            "&sortOrder=descending"
-        )
-    print(f"Making request to arXiv API: {url}")
-    resp = requests.get(url, timeout=30)
-    
-    if not resp.ok:
-        print(f"ArXiv API request failed: {resp.status_code} - {resp.text}")
-        raise ValueError(f"Bad response from arXiv API: {resp}\n{resp.text}")
-    
-    data = parse_arxiv_xml(resp.text)
-    return data
-
-
-# Step2: Parse XML
-import xml.etree.ElementTree as ET
-def parse_arxiv_xml(xml_content: str) -> dict:
-    """Parse the XML content from arXiv API response."""
-
-    entries = []
-    ns = {
-        "atom": "http://www.w3.org/2005/Atom",
-        "arxiv": "http://arxiv.org/schemas/atom"
-    }
-    root = ET.fromstring(xml_content)
-    # Loop through each <entry> in Atom namespace
-    for entry in root.findall("atom:entry", ns):
-        # Extract authors
-        authors = [
-            author.findtext("atom:name", namespaces=ns)
-            for author in entry.findall("atom:author", ns)
-        ]
-        
-        # Extract categories (term attribute)
-        categories = [
-            cat.attrib.get("term")
-            for cat in entry.findall("atom:category", ns)
-        ]
-        
-        # Extract PDF link (rel="related" and type="application/pdf")
-        pdf_link = None
-        for link in entry.findall("atom:link", ns):
-            if link.attrib.get("type") == "application/pdf":
-                pdf_link = link.attrib.get("href")
-                break
-
-        published = entry.findtext("atom:published", namespaces=ns)
-        updated = entry.findtext("atom:updated", namespaces=ns)
-
-        entries.append({
-            "title": entry.findtext("atom:title", namespaces=ns),
-            "summary": entry.findtext("atom:summary", namespaces=ns).strip(),
-            "authors": authors,
-            "categories": categories,
-            "pdf": pdf_link,
-            "published": published,
-            "updated": updated,
-        })
-
-    return {"entries": entries}
-
-
-
-# Step3: Convert the functionality into a tool
-from langchain_core.tools import tool
-
-
-@tool
-def arxiv_search(topic: str) -> dict:
-    """Search for recently uploaded arXiv papers
-
-    Args:
-        topic: The topic to search for papers about
-
-    Returns:
-        List of papers with their metadata including title, authors, summary, etc.
-    """
-    print("ARXIV Agent called")
-    print(f"Searching arXiv for papers about: {topic}")
-    papers = search_arxiv_papers(topic)
-    if len(papers) == 0:
-        print(f"No papers found for topic: {topic}")
-        raise ValueError(f"No papers found for topic: {topic}")
-    print(f"Found {len(papers['entries'])} papers about {topic}")
+# Step1: Access arXiv using URL
+import asyncio
+import os
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import quote
+import httpx
+import requests
+from cache import TTLCache
+from corpus import corpus
+from identity import Deduper, parse_arxiv_id
+from local_index import LocalIndex
+from rate_limit import PRIORITY_INTERACTIVE, RateLimiter
+
+
+# Repeated topics (popular-topic buttons, alert checks) are served from here
+search_cache = TTLCache(
+    max_entries=int(os.getenv("ARXIV_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("ARXIV_CACHE_TTL", "900")),
+    path=os.getenv("ARXIV_CACHE_PATH") or None,
+)
+
+
+# Every fetched entry is added here so already-seen papers are searchable offline
+local_index = LocalIndex(os.getenv("LOCAL_INDEX_PATH", "local_index.db"), corpus=corpus)
+
+
+def _index_entries(entries) -> None:
+    try:
+        local_index.add_many(entries)
+    except Exception as e:
+        print(f"Local index update failed: {e}")
+
+
+# arXiv asks API clients to wait ~3 seconds between consecutive calls. The bucket
+# is shared by every thread and worker process on this host.
+ARXIV_MIN_INTERVAL = float(os.getenv("ARXIV_MIN_INTERVAL", "3.0"))
+arxiv_limiter = RateLimiter(
+    rate=1.0 / ARXIV_MIN_INTERVAL,
+    burst=1.0,
+    path=os.getenv("ARXIV_RATE_LIMIT_PATH") or None,
+    name="arxiv",
+)
+
+
+def _normalize_query(topic: str) -> str:
+    # Preserve boolean operators AND/OR/NOT/ANDNOT in uppercase for arXiv queries
+    for char in list('()"'):
+        if char in topic:
+            print(f"Invalid character '{char}' in query: {topic}")
+            raise ValueError(f"Cannot have character: '{char}' in query: {topic}")
+    norm = []
+    for t in topic.strip().split():
+        if t.lower() in {"and", "or", "not", "andnot"}:
+            norm.append(t.upper())
+        else:
+            # Every other word is URL-encoded so '&', '#', '+' and '%' stay part of the term
+            norm.append(quote(t, safe=""))
+    return "+".join(norm)
+
+
+# Structured queries: field prefixes, boolean composition and date ranges, built
+# directly in URL-encoded form (spaces as '+', parentheses/quotes/brackets escaped).
+QUERY_FIELDS = {"ti", "au", "abs", "co", "jr", "cat", "rn", "id", "all"}
+
+
+def _encode_value(value: str) -> str:
+    for char in list('()"'):
+        if char in value:
+            raise ValueError(f"Cannot have character: '{char}' in query: {value}")
+    words = [quote(w, safe="") for w in value.split()]
+    if not words:
+        raise ValueError("Empty query value")
+    # Several words are searched as one phrase
+    return words[0] if len(words) == 1 else "%22" + "+".join(words) + "%22"
+
+
+def field_clause(field: str, value: str) -> str:
+    """One fielded term, e.g. field_clause("au", "Yann LeCun") -> 'au:%22Yann+LeCun%22'."""
+    if field not in QUERY_FIELDS:
+        raise ValueError(f"Unknown arXiv query field: {field}")
+    return f"{field}:{_encode_value(value)}"
+
+
+def _group(clauses: Sequence[str], op: str) -> str:
+    clauses = [c for c in clauses if c]
+    if len(clauses) <= 1:
+        return clauses[0] if clauses else ""
+    return "%28" + f"+{op}+".join(clauses) + "%29"
+
+
+def any_of(*clauses: str) -> str:
+    return _group(clauses, "OR")
+
+
+def all_of(*clauses: str) -> str:
+    return _group(clauses, "AND")
+
+
+def but_not(clause: str, excluded: str) -> str:
+    return f"%28{clause}+ANDNOT+{excluded}%29"
+
+
+def _arxiv_time(value, end_of_day: bool) -> str:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.strftime("%Y%m%d%H%M")
+    return value.strftime("%Y%m%d") + ("2359" if end_of_day else "0000")
+
+
+def submitted_between(date_from=None, date_to=None) -> str:
+    """submittedDate range clause; either bound may be open."""
+    lo = _arxiv_time(date_from, False) if date_from else "199101010000"
+    hi = _arxiv_time(date_to or date.today(), True)
+    return f"submittedDate:%5B{lo}+TO+{hi}%5D"
+
+
+@dataclass(frozen=True)
+class ArxivQuery:
+    """Search criteria combined with AND. `terms` is free text (AND/OR/NOT allowed) over all fields."""
+    terms: str = ""
+    title: str = ""
+    author: str = ""
+    abstract: str = ""
+    categories: Tuple[str, ...] = ()  # matches any of them
+    submitted_from: Optional[date] = None
+    submitted_to: Optional[date] = None
+
+    def to_search_query(self) -> str:
+        clauses = []
+        terms = "all:" + _normalize_query(self.terms) if self.terms.strip() else ""
+        if terms:
+            clauses.append(terms)
+        if self.title.strip():
+            clauses.append(field_clause("ti", self.title))
+        if self.author.strip():
+            clauses.append(field_clause("au", self.author))
+        if self.abstract.strip():
+            clauses.append(field_clause("abs", self.abstract))
+        if self.categories:
+            clauses.append(any_of(*(field_clause("cat", c) for c in self.categories)))
+        if self.submitted_from or self.submitted_to:
+            clauses.append(submitted_between(self.submitted_from, self.submitted_to))
+        if not clauses:
+            raise ValueError("Empty arXiv query")
+        if len(clauses) == 1:
+            # A plain topic keeps the exact URL it always had
+            return clauses[0]
+        if terms and "+" in terms:
+            clauses[0] = f"%28{terms}%29"
+        return "+AND+".join(clauses)
+
+
+def _search_query(topic: str, query: Optional[ArxivQuery]) -> str:
+    if query is None:
+        query = ArxivQuery(terms=topic)
+    elif topic and not query.terms:
+        query = replace(query, terms=topic)
+    return query.to_search_query()
+
+
+def _cache_key(search_query: str, start: int, max_results: int, sort_by: str, sort_order: str) -> str:
+    # arXiv terms are case-insensitive; operators are already uppercased
+    terms = "+".join(t if t in {"AND", "OR", "NOT", "ANDNOT", "TO"} else t.lower() for t in search_query.split("+"))
+    return f"search|{terms}|{start}|{max_results}|{sort_by}|{sort_order}"
+
+
+def _build_url(search_query: str, start: int, max_results: int, sort_by: str, sort_order: str) -> str:
+    return (
+            "http://export.arxiv.org/api/query"
+            f"?search_query={search_query}"
+            f"&start={start}"
+            f"&max_results={max_results}"
+            f"&sortBy={sort_by}"
+            f"&sortOrder={sort_order}"
+        )
+
+
+# One pooled keep-alive session for all blocking calls
+_session = requests.Session()
+
+
+def search_arxiv_papers(
+    topic: str,
+    max_results: int = 5,
+    start: int = 0,
+    sort_by: str = "submittedDate",
+    sort_order: str = "descending",
+    priority: int = PRIORITY_INTERACTIVE,
+    query: Optional[ArxivQuery] = None,
+) -> dict:
+    """Search arXiv by free-text topic, or by structured `query` (fields, categories, dates)."""
+    search_query = _search_query(topic, query)
+    key = _cache_key(search_query, start, max_results, sort_by, sort_order)
+    cached = search_cache.get(key)
+    if cached is not None:
+        return cached
+    url = _build_url(search_query, start, max_results, sort_by, sort_order)
+    arxiv_limiter.acquire(priority)
+    print(f"Making request to arXiv API: {url}")
+    resp = _session.get(url, timeout=30, stream=True)
+    
+    if not resp.ok:
+        print(f"ArXiv API request failed: {resp.status_code} - {resp.text}")
+        raise ValueError(f"Bad response from arXiv API: {resp}\n{resp.text}")
+    
+    # Parse the body as it downloads instead of buffering the whole feed
+    with resp:
+        data = {"entries": list(iter_arxiv_entries(resp.iter_content(chunk_size=65536)))}
+    search_cache.set(key, data)
+    _index_entries(data["entries"])
+    return data
+
+
+# Async client shared by the FastAPI routes; created lazily on the running loop
+_async_client: Optional[httpx.AsyncClient] = None
+# Single-flight: cache key -> task fetching it, so concurrent identical searches share one request
+_inflight: Dict[str, "asyncio.Task"] = {}
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _async_client
+
+
+async def close_async_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+async def _fetch_async(url: str, key: str, priority: int) -> dict:
+    await arxiv_limiter.acquire_async(priority)
+    print(f"Making request to arXiv API: {url}")
+    parser = AtomEntryParser()
+    entries = []
+    async with _get_async_client().stream("GET", url) as resp:
+        if resp.status_code >= 400:
+            body = (await resp.aread()).decode("utf-8", "replace")
+            print(f"ArXiv API request failed: {resp.status_code} - {body}")
+            raise ValueError(f"Bad response from arXiv API: {resp}\n{body}")
+        async for chunk in resp.aiter_bytes():
+            entries.extend(parser.feed(chunk))
+    entries.extend(parser.close())
+    data = {"entries": entries}
+    search_cache.set(key, data)
+    await asyncio.to_thread(_index_entries, entries)
+    return data
+
+
+async def async_search_arxiv_papers(
+    topic: str,
+    max_results: int = 5,
+    start: int = 0,
+    sort_by: str = "submittedDate",
+    sort_order: str = "descending",
+    priority: int = PRIORITY_INTERACTIVE,
+    query: Optional[ArxivQuery] = None,
+) -> dict:
+    """Non-blocking search_arxiv_papers: pooled connections plus request coalescing."""
+    search_query = _search_query(topic, query)
+    key = _cache_key(search_query, start, max_results, sort_by, sort_order)
+    cached = search_cache.get(key)
+    if cached is not None:
+        return cached
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_async(_build_url(search_query, start, max_results, sort_by, sort_order), key, priority))
+        _inflight[key] = task
+        task.add_done_callback(lambda _t: _inflight.pop(key, None))
+    # Shield so one cancelled caller doesn't abort the fetch for everyone else
+    return await asyncio.shield(task)
+
+
+def iter_arxiv_pages(
+    topic: str,
+    max_results: int = 100,
+    page_size: int = 50,
+    sort_by: str = "submittedDate",
+    sort_order: str = "descending",
+    priority: int = PRIORITY_INTERACTIVE,
+    query: Optional[ArxivQuery] = None,
+):
+    """Lazily fetch successive result pages, yielding each page's entries as it arrives.
+
+    Page requests are spaced by arxiv_limiter, like every other arXiv call.
+    Papers already yielded on an earlier page (results shift when new papers
+    are submitted between requests) are dropped, and near-duplicate titles are
+    flagged with "near_duplicate_of".
+    """
+    start = 0
+    page_size = max(1, min(page_size, max_results))
+    seen = Deduper()
+    while start < max_results:
+        size = min(page_size, max_results - start)
+        entries = search_arxiv_papers(
+            topic, max_results=size, start=start, sort_by=sort_by, sort_order=sort_order, priority=priority, query=query
+        )["entries"]
+        # Copies, so flags don't leak into the cached response
+        fresh = list(seen.filter(dict(e) for e in entries))
+        if fresh:
+            yield fresh
+        if len(entries) < size:
+            break
+        start += size
+
+
+# Step2: Parse XML
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, List, Union
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _entry_to_dict(entry: ET.Element) -> dict:
+    first_text = {}
+    authors = []
+    categories = []
+    pdf_link = None
+    for child in entry:
+        tag = child.tag
+        if tag == _ATOM + "author":
+            name = child.find(_ATOM + "name")
+            authors.append(None if name is None else (name.text or ""))
+        elif tag == _ATOM + "category":
+            # Extract categories (term attribute)
+            categories.append(child.attrib.get("term"))
+        elif tag == _ATOM + "link":
+            # Extract PDF link (rel="related" and type="application/pdf")
+            if pdf_link is None and child.attrib.get("type") == "application/pdf":
+                pdf_link = child.attrib.get("href")
+        elif tag not in first_text:
+            first_text[tag] = child.text or ""
+    arxiv_id, version = parse_arxiv_id(first_text.get(_ATOM + "id") or pdf_link)
+    return {
+        "id": first_text.get(_ATOM + "id"),
+        "arxiv_id": arxiv_id,
+        "version": version,
+        "title": first_text.get(_ATOM + "title"),
+        "summary": (first_text.get(_ATOM + "summary") or "").strip(),
+        "authors": authors,
+        "categories": categories,
+        "pdf": pdf_link,
+        "published": first_text.get(_ATOM + "published"),
+        "updated": first_text.get(_ATOM + "updated"),
+    }
+
+
+class AtomEntryParser:
+    """Push-style incremental Atom parser: feed() body chunks, get finished entries back.
+
+    Finished <entry> elements are dropped from the tree so memory stays flat
+    regardless of feed size.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self._depth = 0
+
+    def feed(self, chunk: Union[bytes, str]) -> List[dict]:
+        if not chunk:
+            return []
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[dict]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[dict]:
+        out = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                self._depth += 1
+                continue
+            self._depth -= 1
+            # Only top-level <entry> children of <feed> are papers
+            if self._depth == 1 and elem.tag == _ATOM + "entry":
+                out.append(_entry_to_dict(elem))
+                elem.clear()
+                self._root.remove(elem)
+        return out
+
+
+def iter_arxiv_entries(chunks: Iterable[Union[bytes, str]]) -> Iterator[dict]:
+    """Incrementally parse an arXiv Atom feed, yielding one entry dict at a time.
+
+    `chunks` can be any iterable of bytes/str pieces, e.g. an HTTP body read in
+    chunks.
+    """
+    parser = AtomEntryParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def parse_arxiv_xml(xml_content: str) -> dict:
+    """Parse the XML content from arXiv API response."""
+    return {"entries": list(iter_arxiv_entries([xml_content]))}
+
+
+
+# Step3: Convert the functionality into a tool
+from langchain_core.tools import tool
+
+
+@tool
+def arxiv_search(
+    topic: str,
+    max_results: int = 5,
+    author: str = "",
+    category: str = "",
+    submitted_after: str = "",
+) -> dict:
+    """Search for recently uploaded arXiv papers
+
+    Args:
+        topic: The topic to search for papers about
+        max_results: Maximum number of papers to return
+        author: Only papers by this author (optional)
+        category: Only papers in this arXiv category, e.g. cs.LG (optional)
+        submitted_after: Only papers submitted on or after this date, YYYY-MM-DD (optional)
+
+    Returns:
+        List of papers with their metadata including title, authors, summary, etc.
+    """
+    print("ARXIV Agent called")
+    print(f"Searching arXiv for papers about: {topic}")
+    query = ArxivQuery(
+        terms=topic,
+        author=author,
+        categories=(category,) if category else (),
+        submitted_from=date.fromisoformat(submitted_after) if submitted_after else None,
+    )
+    papers = search_arxiv_papers(topic, max_results=max_results, query=query)
+    if len(papers) == 0:
+        print(f"No papers found for topic: {topic}")
+        raise ValueError(f"No papers found for topic: {topic}")
+    print(f"Found {len(papers['entries'])} papers about {topic}")
     return papers
\ No newline at end of file
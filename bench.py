@@ -0,0 +1,524 @@
+"""
+Micro-benchmarks for the AI Researcher Agent hot paths.
+
+Each case runs in a fresh subprocess so peak RSS is measured per case.
+
+    python bench.py parse          # Atom feed parsing, 10 / 1k / 50k entries
+    python bench.py paper          # per-paper memory, dict vs Paper, 100k corpus
+    python bench.py text           # offline text path (split/tokenize/ELI5/summarize/chat)
+    python bench.py filter         # result-view filter/sort, closures vs FilterIndex
+    python bench.py pdf            # full-text extraction of a 200-paper reading list, inline vs process pool
+    python bench.py corpus         # abstracts by id: JSON loaded into the heap vs the mmap corpus
+    python bench.py export         # JSON download of a result list, json.dumps vs streaming writer
+    python bench.py dedupe         # alert check across watches, extend-all vs exact vs MinHash dedupe
+"""
+import argparse
+import json
+import random
+import re
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+
+def synthetic_feed_chunks(n_entries, chunk_size=65536):
+    """Yield an arXiv-like Atom feed in byte chunks, as an HTTP body would arrive."""
+    buf = [b'<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n']
+    size = len(buf[0])
+    for i in range(n_entries):
+        entry = (
+            f"<entry><id>http://arxiv.org/abs/2401.{i:05d}v1</id>"
+            f"<updated>2024-01-02T00:00:00Z</updated><published>2024-01-01T00:00:00Z</published>"
+            f"<title>Synthetic paper {i} on scalable learning</title>"
+            f"<summary>{'We propose a robust method for large scale optimization. ' * 15}</summary>"
+            f"<author><name>Author {i % 97}</name></author><author><name>Second Author</name></author>"
+            f'<link href="http://arxiv.org/abs/2401.{i:05d}v1" rel="alternate" type="text/html"/>'
+            f'<link title="pdf" href="http://arxiv.org/pdf/2401.{i:05d}v1" rel="related" type="application/pdf"/>'
+            f'<category term="cs.LG"/><category term="stat.ML"/></entry>\n'
+        ).encode("utf-8")
+        buf.append(entry)
+        size += len(entry)
+        if size >= chunk_size:
+            yield b"".join(buf)
+            buf, size = [], 0
+    buf.append(b"</feed>\n")
+    yield b"".join(buf)
+
+
+def _legacy_parse_arxiv_xml(xml_content):
+    # The original ET.fromstring + findall implementation, kept as the baseline
+    entries = []
+    ns = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+    root = ET.fromstring(xml_content)
+    for entry in root.findall("atom:entry", ns):
+        authors = [a.findtext("atom:name", namespaces=ns) for a in entry.findall("atom:author", ns)]
+        categories = [c.attrib.get("term") for c in entry.findall("atom:category", ns)]
+        pdf_link = None
+        for link in entry.findall("atom:link", ns):
+            if link.attrib.get("type") == "application/pdf":
+                pdf_link = link.attrib.get("href")
+                break
+        entries.append({
+            "title": entry.findtext("atom:title", namespaces=ns),
+            "summary": entry.findtext("atom:summary", namespaces=ns).strip(),
+            "authors": authors,
+            "categories": categories,
+            "pdf": pdf_link,
+            "published": entry.findtext("atom:published", namespaces=ns),
+            "updated": entry.findtext("atom:updated", namespaces=ns),
+        })
+    return {"entries": entries}
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_parse_case(impl, n):
+    from arxiv_tool import iter_arxiv_entries
+
+    baseline = _peak_rss_mb()
+    t0 = time.perf_counter()
+    if impl == "legacy":
+        # The legacy path needs the whole body as one string (resp.text)
+        body = b"".join(synthetic_feed_chunks(n)).decode("utf-8")
+        count = len(_legacy_parse_arxiv_xml(body)["entries"])
+    else:
+        count = sum(1 for _ in iter_arxiv_entries(synthetic_feed_chunks(n)))
+    elapsed = time.perf_counter() - t0
+    return {"impl": impl, "entries": count, "seconds": elapsed,
+            "entries_per_s": count / elapsed if elapsed else 0.0,
+            "peak_rss_mb": _peak_rss_mb(), "rss_growth_mb": _peak_rss_mb() - baseline}
+
+
+def run_paper_case(impl, n):
+    from arxiv_tool import iter_arxiv_entries
+    from paper import Paper
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    if impl == "dict":
+        corpus = list(iter_arxiv_entries(synthetic_feed_chunks(n)))
+    else:
+        corpus = [Paper.from_dict(e) for e in iter_arxiv_entries(synthetic_feed_chunks(n))]
+    elapsed = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Text payload shared by both layouts, to separate it from per-record overhead
+    text_bytes = sum(sys.getsizeof(p["title"]) + sys.getsizeof(p["summary"]) + sys.getsizeof(p["pdf"]) for p in corpus)
+    return {"impl": impl, "papers": len(corpus), "seconds": elapsed,
+            "total_mb": current / (1024 * 1024), "bytes_per_paper": current / len(corpus),
+            "overhead_bytes_per_paper": (current - text_bytes) / len(corpus)}
+
+
+_ABSTRACT_WORDS = (
+    "we propose a novel robust method for large scale optimization of neural network architecture "
+    "our approach utilize approximately fewer parameters and demonstrate significant improvements "
+    "the evaluation shows results that outperform strong baselines on complex benchmarks "
+    "this methodology simplify training while the objective and hypothesis remain clear "
+    "transformer attention diffusion graph reinforcement learning data model inference"
+).split()
+
+
+def synthetic_abstracts(n, seed=7):
+    """Abstract-length texts (~8 sentences, ~180 words) built from scientific vocabulary."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        sentences = []
+        for _ in range(rng.randint(6, 10)):
+            words = [rng.choice(_ABSTRACT_WORDS) for _ in range(rng.randint(14, 30))]
+            sentences.append(" ".join(words).capitalize() + rng.choice([".", ".", ".", "!", "?"]))
+        out.append("  ".join(sentences))
+    return out
+
+
+# Pre-pipeline offline text helpers, kept as the regression baseline
+def _legacy_split_sentences(text):
+    text = re.sub(r"\s+", " ", text.strip())
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    return [s.strip() for s in sentences if len(s.strip()) > 0]
+
+
+def _legacy_tokenize(text):
+    from ai_services import _STOPWORDS
+    tokens = re.findall(r"[A-Za-z][A-Za-z\-']+", text.lower())
+    return [t for t in tokens if t not in _STOPWORDS]
+
+
+def _legacy_simplify_eli5(text):
+    from ai_services import _ELI5_REPLACEMENTS
+    out = text
+    for k, v in _ELI5_REPLACEMENTS.items():
+        out = re.sub(rf"\b{k}\b", v, out, flags=re.IGNORECASE)
+    clipped = []
+    for s in _legacy_split_sentences(out):
+        if len(s) > 220:
+            s = s[:200].rstrip() + "..."
+        clipped.append(s)
+    return " ".join(clipped)
+
+
+def _legacy_offline_summarize(text):
+    from ai_services import _assemble_summary
+    sentences = _legacy_split_sentences(text)
+    all_tokens = []
+    for s in sentences:
+        all_tokens.extend(_legacy_tokenize(s))
+    freq = {}
+    for t in all_tokens:
+        freq[t] = freq.get(t, 0) + 1
+    max_f = max(freq.values()) if freq else 1
+    scores = []
+    for s in sentences:
+        tokens = _legacy_tokenize(s)
+        scores.append(sum(freq.get(t, 0) for t in tokens) / (len(tokens) * max_f) if tokens else 0.0)
+    return _assemble_summary(text, sentences, scores, 5, False)
+
+
+def _legacy_offline_chat(context, question):
+    sents = _legacy_split_sentences(context)
+    q_tokens = set(_legacy_tokenize(question))
+    scored = sorted(((len(q_tokens & set(_legacy_tokenize(s))), s) for s in sents), key=lambda x: x[0], reverse=True)
+    return " ".join(s for o, s in scored[:3] if o > 0)
+
+
+def run_text_case(func, impl, n=2_000, repeat=3):
+    import ai_services as ai
+
+    corpus = synthetic_abstracts(n)
+    question = "What method do they propose and how does it outperform baselines?"
+    funcs = {
+        ("split_sentences", "legacy"): _legacy_split_sentences,
+        ("split_sentences", "pipeline"): ai._split_sentences,
+        ("tokenize", "legacy"): _legacy_tokenize,
+        ("tokenize", "pipeline"): ai._tokenize,
+        ("simplify_eli5", "legacy"): _legacy_simplify_eli5,
+        ("simplify_eli5", "pipeline"): ai._simplify_eli5,
+        ("offline_summarize", "legacy"): _legacy_offline_summarize,
+        ("offline_summarize", "pipeline"): ai.offline_summarize,
+        ("offline_chat", "legacy"): lambda t: _legacy_offline_chat(t, question),
+        ("offline_chat", "pipeline"): lambda t: ai.offline_chat(t, question),
+    }
+    fn = funcs[(func, impl)]
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return {"func": func, "impl": impl, "texts": n, "best_seconds": best, "us_per_text": best / n * 1e6}
+
+
+def synthetic_papers(n, seed=11):
+    """Papers with spread-out dates, a few authors and 1-3 categories each."""
+    from datetime import datetime, timedelta, timezone
+    from paper import Paper
+
+    rng = random.Random(seed)
+    cats = ["cs.AI", "cs.LG", "cs.CV", "cs.CL", "stat.ML", "quant-ph", "cs.RO", "math.OC"]
+    now = datetime.now(timezone.utc)
+    return [
+        Paper(
+            title=f"Paper {i}", summary="", id=f"2401.{i:05d}",
+            authors=tuple(f"Author {rng.randint(0, 300)} Name" for _ in range(rng.randint(1, 6))),
+            categories=tuple(rng.sample(cats, rng.randint(1, 3))),
+            published=now - timedelta(days=rng.randint(0, 900)),
+        )
+        for i in range(n)
+    ]
+
+
+def _legacy_filter(papers, flt):
+    # The closures the Streamlit result view used to rebuild on every rerun
+    import datetime as _dt
+    today = _dt.date.today()
+
+    def _date_ok(p):
+        if flt.get("date_range") == "All time":
+            return True
+        pub = (p.published or p.updated).date() if (p.published or p.updated) else None
+        if not pub:
+            return True
+        days = {"Last 7 days": 7, "Last 30 days": 30, "Last 365 days": 365}.get(flt.get("date_range"), 0)
+        return (today - pub).days <= days if days else True
+
+    def _author_ok(p):
+        a = flt.get("author", "").lower()
+        return not a or any(a in x.lower() for x in p.get("authors", []))
+
+    def _category_ok(p):
+        cats = flt.get("categories", [])
+        pcats = set(p.get("categories", []))
+        return not cats or any(c in pcats for c in cats)
+
+    filtered = [p for p in papers if _date_ok(p) and _author_ok(p) and _category_ok(p)]
+    _epoch = _dt.datetime.min.replace(tzinfo=_dt.timezone.utc)
+    if flt.get("sort") == "Newest first":
+        filtered.sort(key=lambda p: p.published or _epoch, reverse=True)
+    elif flt.get("sort") == "Oldest first":
+        filtered.sort(key=lambda p: p.published or _epoch)
+    return filtered
+
+
+def run_filter_case(impl, n, reruns=200):
+    from filters import FilterIndex, SORT_NEWEST, SORT_OLDEST
+
+    papers = synthetic_papers(n)
+    # A session cycling through a handful of filter settings, as widget reruns do
+    settings = [
+        {"date_range": "Last 365 days", "author": "author 1", "categories": ["cs.LG", "cs.CV"], "sort": "Newest first"},
+        {"date_range": "All time", "author": "", "categories": ["stat.ML"], "sort": "Oldest first"},
+        {"date_range": "Last 30 days", "author": "", "categories": [], "sort": "Relevance (default)"},
+        {"date_range": "Last 365 days", "author": "name", "categories": [], "sort": "Newest first"},
+    ]
+    days = {"Last 7 days": 7, "Last 30 days": 30, "Last 365 days": 365}
+    sorts = {"Newest first": SORT_NEWEST, "Oldest first": SORT_OLDEST}
+    t0 = time.perf_counter()
+    index = FilterIndex(papers) if impl != "legacy" else None
+    build = time.perf_counter() - t0
+    kept = 0
+    for r in range(reruns):
+        flt = settings[r % len(settings)]
+        if impl == "legacy":
+            out = _legacy_filter(papers, flt)
+        else:
+            if impl == "index_nomemo":
+                index._memo.clear()
+            out = index.apply(days=days.get(flt["date_range"]), author=flt["author"],
+                              categories=flt["categories"], sort=sorts.get(flt["sort"]))
+        kept += len(out)
+    elapsed = time.perf_counter() - t0
+    return {"impl": impl, "papers": n, "reruns": reruns, "build_ms": build * 1e3,
+            "total_ms": elapsed * 1e3, "us_per_rerun": elapsed / reruns * 1e6, "kept": kept}
+
+
+def synthetic_pdf(path, pages, seed=0):
+    """A minimal text-only PDF: a heading and ~45 lines of prose per page."""
+    rng = random.Random(seed)
+    words = "model training data results method network learning layer attention loss gradient".split()
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for p in range(pages):
+        lines = [f"{p + 1} Section {p + 1}"] + [" ".join(rng.choices(words, k=12)) for _ in range(45)]
+        ops = "".join(f"({line}) Tj T* " for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 780 Td {ops}ET"
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents {len(objs)} 0 R >>")
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+    out, offsets = b"%PDF-1.4\n", []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def run_pdf_case(impl, n, pages=12):
+    import os
+    import tempfile
+    import threading
+    from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+    tmp = tempfile.mkdtemp(prefix="pdfbench-")
+    os.makedirs(os.path.join(tmp, "papers"))
+    for i in range(n):
+        synthetic_pdf(os.path.join(tmp, "papers", f"{i}.pdf"), pages, seed=i)
+    os.environ["PDF_CACHE_DIR"] = os.path.join(tmp, "cache")
+    os.environ["CORPUS_DIR"] = os.path.join(tmp, "corpus")
+
+    class Quiet(SimpleHTTPRequestHandler):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, directory=os.path.join(tmp, "papers"), **kw)
+
+        def log_message(self, *a):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Quiet)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_port}/{i}.pdf" for i in range(n)]
+
+    import contextlib
+    import io
+    with contextlib.redirect_stdout(io.StringIO()):  # per-download log lines
+        from read_pdf import ExtractionPool, load_fulltext, pdf_cache
+        t0 = time.perf_counter()
+        if impl == "inline":
+            # What a request handler did before: download + parse on the calling thread
+            done = sum(1 for u in urls if load_fulltext(u, max_pages=pages)["sections"])
+            workers = 1
+        else:
+            pool = ExtractionPool(max_pages=pages, cache=pdf_cache)
+            workers = pool.workers
+            done = sum(1 for job in pool.extract_many(urls) if job["status"] == "done")
+            pool.shutdown()
+        elapsed = time.perf_counter() - t0
+    server.shutdown()
+    return {"impl": impl, "papers": n, "pages": pages, "workers": workers, "done": done,
+            "total_s": elapsed, "ms_per_paper": elapsed / n * 1e3}
+
+
+def run_corpus_case(impl, n, lookups=20_000):
+    import os
+    import tempfile
+
+    tmp = tempfile.mkdtemp(prefix="corpusbench-")
+    texts = synthetic_abstracts(n)
+    keys = [f"2401.{i:05d}v1" for i in range(n)]
+    json_path = os.path.join(tmp, "abstracts.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(dict(zip(keys, texts)), f)
+    from corpus import Corpus
+    writer = Corpus(tmp)
+    writer.put_many(zip(keys, texts))
+    writer.get(keys[0])  # pulls in numpy (imported lazily by Corpus) before the measurements
+    del texts, writer
+
+    rng = random.Random(3)
+    wanted = [rng.choice(keys) for _ in range(lookups)]
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    if impl == "json":
+        # What each process did with session/JSON state: the whole corpus as str objects
+        with open(json_path, encoding="utf-8") as f:
+            store = json.load(f)
+        get = store.get
+    else:
+        get = Corpus(tmp).get
+    get(keys[0])
+    load = time.perf_counter() - t0
+    heap = tracemalloc.get_traced_memory()[0]  # what stays resident in this process's heap
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    chars = sum(len(get(k)) for k in wanted)
+    elapsed = time.perf_counter() - t0
+    return {"impl": impl, "papers": n, "load_ms": load * 1e3, "heap_mb": heap / 1e6,
+            "us_per_lookup": elapsed / lookups * 1e6, "chars": chars}
+
+
+def run_export_case(impl, n):
+    import os
+
+    from export import export
+
+    papers = synthetic_papers(n)
+    for p, text in zip(papers, synthetic_abstracts(n)):
+        p.summary = text
+    def run():
+        with open(os.devnull, "w", encoding="utf-8") as out:
+            if impl == "legacy":
+                # The Streamlit download: whole document built as one string, on every rerun
+                out.write(json.dumps([p.to_dict() for p in papers], indent=2))
+            else:
+                for chunk in export(papers, "json"):
+                    out.write(chunk)
+
+    t0 = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"impl": impl, "papers": n, "total_ms": elapsed * 1e3, "peak_heap_mb": peak / 1e6}
+
+
+def synthetic_result_sets(n, watches=5, seed=13):
+    """Entries as several alert watches return them: overlapping, some as v2, a few retitled copies."""
+    rng = random.Random(seed)
+    titles = [" ".join(text.split()[:12]) for text in synthetic_abstracts(n, seed=seed)]
+    sets = [[] for _ in range(watches)]
+    for i, title in enumerate(titles):
+        version = 2 if rng.random() < 0.3 else 1
+        entry = {"id": f"http://arxiv.org/abs/2401.{i:05d}v{version}", "title": title, "summary": title}
+        for w in rng.sample(range(watches), rng.randint(1, 3)):
+            sets[w].append(dict(entry))
+        if rng.random() < 0.05:
+            sets[rng.randrange(watches)].append({"id": f"http://arxiv.org/abs/2402.{i:05d}v1", "title": title + ".", "summary": title})
+    return sets
+
+
+def run_dedupe_case(impl, n):
+    from identity import Deduper
+
+    sets = synthetic_result_sets(n)
+    t0 = time.perf_counter()
+    if impl == "legacy":
+        # The old alert check: found.extend(...) per watch, repeats and all
+        found = []
+        for entries in sets:
+            found.extend(entries)
+        flagged = 0
+    else:
+        d = Deduper(None if impl == "exact" else 0.8)
+        for entries in sets:
+            for entry in entries:
+                d.add(entry)
+        found = d.entries
+        flagged = sum("near_duplicate_of" in e for e in found)
+    elapsed = time.perf_counter() - t0
+    return {"impl": impl, "papers": n, "fetched": sum(map(len, sets)), "kept": len(found), "flagged": flagged,
+            "total_ms": elapsed * 1e3, "payload_mb": len(json.dumps(found)) / 1e6}
+
+
+CASES = {
+    "parse": [(impl, n) for n in (10, 1_000, 50_000) for impl in ("legacy", "streaming")],
+    "paper": [(impl, 100_000) for impl in ("dict", "paper")],
+    "text": [(func, impl) for func in ("split_sentences", "tokenize", "simplify_eli5", "offline_summarize", "offline_chat")
+             for impl in ("legacy", "pipeline")],
+    "filter": [(impl, n) for n in (100, 500, 5_000) for impl in ("legacy", "index_nomemo", "index")],
+    "pdf": [(impl, 200) for impl in ("inline", "pool")],
+    "corpus": [(impl, n) for n in (10_000, 100_000) for impl in ("json", "corpus")],
+    "export": [(impl, n) for n in (50, 50_000) for impl in ("legacy", "stream")],
+    "dedupe": [(impl, n) for n in (100, 10_000) for impl in ("legacy", "exact", "minhash")],
+}
+RUNNERS = {
+    "parse": run_parse_case,
+    "paper": run_paper_case,
+    "text": run_text_case,
+    "filter": run_filter_case,
+    "pdf": run_pdf_case,
+    "corpus": run_corpus_case,
+    "export": run_export_case,
+    "dedupe": run_dedupe_case,
+}
+
+
+def _run_in_subprocess(suite, args):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", suite, *map(str, args)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Researcher Agent benchmarks")
+    parser.add_argument("suite", nargs="?", choices=sorted(CASES), default="parse")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        suite, *params = args.child
+        params = [int(p) if p.isdigit() else p for p in params]
+        print(json.dumps(RUNNERS[suite](*params)))
+        return
+
+    print(f"== {args.suite} ==")
+    for case in CASES[args.suite]:
+        res = _run_in_subprocess(args.suite, case)
+        print("  " + "  ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in res.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Two-tier response cache: an in-memory LRU in front of an optional SQLite file.
+
+Entries expire after a TTL. The disk tier survives restarts and is shared by
+every process pointed at the same file. Either tier can also be capped by the
+total size of the cached values (their JSON encoding), evicting the least
+recently used (memory) or oldest (disk) entries first.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class TTLCache:
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 900.0,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_disk_bytes: Optional[int] = None,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value, size)
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        """The SQLite tier, opened on first use so merely importing a cache creates no file. Call under _lock."""
+        if self._db is None and self.path:
+            db = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, "
+                "size INTEGER NOT NULL DEFAULT 0)"
+            )
+            try:
+                # Files created before size-based eviction existed
+                db.execute("ALTER TABLE cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass
+            db.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+            db.commit()
+            self._db = db
+        return self._db
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                if item[0] > now:
+                    self._mem.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return item[1]
+                self._drop_mem(key)
+                self._counters["expirations"] += 1
+            db = self._disk()
+            if db is not None:
+                row = db.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        value = json.loads(row[0])
+                        self._put_mem(key, value, row[1], len(row[0]))
+                        self._counters["disk_hits"] += 1
+                        return value
+                    db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    db.commit()
+                    self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        expires = time.time() + self.ttl
+        payload = json.dumps(value) if (self.path or self.max_bytes) else None
+        size = len(payload) if payload is not None else 0
+        with self._lock:
+            self._put_mem(key, value, expires, size)
+            db = self._disk()
+            if db is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires, size) VALUES (?, ?, ?, ?)",
+                    (key, payload, expires, size),
+                )
+                if self.max_disk_bytes:
+                    self._trim_disk()
+                db.commit()
+
+    def _drop_mem(self, key: str) -> None:
+        item = self._mem.pop(key, None)
+        if item is not None:
+            self._mem_bytes -= item[2]
+
+    def _put_mem(self, key: str, value: Any, expires: float, size: int) -> None:
+        self._drop_mem(key)
+        self._mem[key] = (expires, value, size)
+        self._mem_bytes += size
+        while len(self._mem) > self.max_entries or (
+            self.max_bytes and self._mem_bytes > self.max_bytes and len(self._mem) > 1
+        ):
+            _, (_, _, old_size) = self._mem.popitem(last=False)
+            self._mem_bytes -= old_size
+            self._counters["evictions"] += 1
+
+    def _trim_disk(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        # Oldest entries (earliest expiry) go first
+        for key, size in self._db.execute("SELECT key, size FROM cache ORDER BY expires").fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+            self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+            db = self._disk()
+            if db is not None:
+                db.execute("DELETE FROM cache")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+            out["size"] = len(self._mem)
+            out["max_entries"] = self.max_entries
+            out["ttl"] = self.ttl
+            out["disk"] = bool(self.path)
+            if self.max_bytes:
+                out["bytes"] = self._mem_bytes
+                out["max_bytes"] = self.max_bytes
+            return out
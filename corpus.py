@@ -0,0 +1,185 @@
+"""
+Append-only, memory-mapped store for paper texts (abstracts and full texts).
+
+    corpus/
+        corpus.dat   records appended back to back: "<kind>:<key>" then the UTF-8 text
+        corpus.idx   one fixed-width entry per record: key hash, offset, key length, text length
+
+Both files are opened with mmap. A lookup is a binary search over the index
+plus a slice of the data map, so texts live in the OS page cache, shared by
+every worker process, rather than in each process's heap. Writers append under
+an exclusive file lock and write the index entry after its data, so readers
+never see an entry whose text is incomplete. Putting a key again appends a new
+record; the newest one wins.
+"""
+import hashlib
+import mmap
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from identity import arxiv_key
+
+try:
+    import fcntl  # Unix only; elsewhere a single writer process is assumed
+except ImportError:
+    fcntl = None
+
+CORPUS_DIR = os.getenv("CORPUS_DIR", "corpus")
+
+ABSTRACT = "abstract"
+FULLTEXT = "fulltext"
+
+# Index entry: key hash, data offset, key length, text length (little endian, 24 bytes)
+_ENTRY_FORMAT = [("hash", "<u8"), ("offset", "<u8"), ("key_len", "<u4"), ("text_len", "<u4")]
+_ENTRY_SIZE = 24
+# Unsorted entries searched linearly before the sorted view is rebuilt
+_TAIL_MAX = 1024
+
+
+def _hash(full_key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(full_key, digest_size=8).digest(), "little")
+
+
+class Corpus:
+    def __init__(self, root: str = CORPUS_DIR):
+        self.root = root
+        self.data_path = os.path.join(root, "corpus.dat")
+        self.index_path = os.path.join(root, "corpus.idx")
+        self._created = False
+        self._lock = threading.Lock()
+        self._n = 0  # entries currently mapped
+        self._sorted = 0  # entries covered by the sorted view
+        self._data: Optional[mmap.mmap] = None
+        self._entries = None  # numpy view over the index map
+        self._order = None  # entry numbers sorted by hash (stable, so newest last among equals)
+        self._hashes = None  # hashes in that order
+
+    def _ensure_files(self) -> None:
+        # Both files must exist before they can be sized or mapped, even while still empty
+        if not self._created:
+            os.makedirs(self.root, exist_ok=True)
+            for path in (self.data_path, self.index_path):
+                open(path, "ab").close()
+            self._created = True
+
+    def _refresh(self) -> None:
+        """Map records appended since the last look, by this or any other process."""
+        import numpy as np
+
+        self._ensure_files()
+        n = os.path.getsize(self.index_path) // _ENTRY_SIZE
+        if n == self._n:
+            return
+        # Old maps are not closed: slices handed out earlier may still point into them
+        with open(self.index_path, "rb") as f:
+            index = mmap.mmap(f.fileno(), n * _ENTRY_SIZE, access=mmap.ACCESS_READ)
+        # Data is written before its index entry, so this map covers all n records
+        with open(self.data_path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        entries = np.frombuffer(index, dtype=np.dtype(_ENTRY_FORMAT), count=n)
+        if self._order is None or n - self._sorted > max(_TAIL_MAX, n // 8):
+            self._order = np.argsort(entries["hash"], kind="stable")
+            self._hashes = entries["hash"][self._order]
+            self._sorted = n
+        # Per-field views of the same map (no copies); scalar access on these is much cheaper
+        self._offsets, self._key_lens, self._text_lens = entries["offset"], entries["key_len"], entries["text_len"]
+        self._entries, self._data, self._n = entries, data, n
+
+    def _key_at(self, i: int) -> bytes:
+        start = int(self._offsets[i])
+        return self._data[start:start + int(self._key_lens[i])]
+
+    def _find(self, h: int, full_key: bytes) -> Optional[int]:
+        import numpy as np
+
+        if not self._n:
+            return None
+        # Newest first: the unsorted tail, then the sorted view from the right
+        if self._sorted < self._n:
+            tail = np.nonzero(self._entries["hash"][self._sorted:] == h)[0]
+            for i in reversed(tail.tolist()):
+                if self._key_at(self._sorted + i) == full_key:
+                    return self._sorted + i
+        # Equal hashes are adjacent and in append order; 64-bit collisions are rare, so this is ~1 step
+        j = int(self._hashes.searchsorted(np.uint64(h)))
+        found = None
+        while j < self._sorted and int(self._hashes[j]) == h:
+            i = int(self._order[j])
+            if self._key_at(i) == full_key:
+                found = i
+            j += 1
+        return found
+
+    def view(self, key: str, kind: str = ABSTRACT) -> Optional[memoryview]:
+        """Zero-copy slice of the stored UTF-8 text, or None."""
+        full_key = f"{kind}:{arxiv_key(key)}".encode("utf-8")
+        h = _hash(full_key)
+        with self._lock:
+            # One stat per lookup picks up appends (and newer versions) from other processes
+            self._refresh()
+            i = self._find(h, full_key)
+            if i is None:
+                return None
+            start = int(self._offsets[i]) + int(self._key_lens[i])
+            return memoryview(self._data)[start:start + int(self._text_lens[i])]
+
+    def get(self, key: str, kind: str = ABSTRACT) -> Optional[str]:
+        text = self.view(key, kind)
+        return None if text is None else str(text, "utf-8")
+
+    def __contains__(self, key: str) -> bool:
+        return self.view(key) is not None
+
+    def put_many(self, items: Iterable[Tuple[str, str]], kind: str = ABSTRACT) -> int:
+        """Append (key, text) pairs. Unchanged texts are skipped. Returns the count written."""
+        pending = []
+        for key, text in items:
+            if not key or not text:
+                continue
+            body = text.encode("utf-8")
+            current = self.view(key, kind)
+            if current is not None and current == body:
+                continue
+            full_key = f"{kind}:{arxiv_key(key)}".encode("utf-8")
+            pending.append((full_key, body))
+        if not pending:
+            return 0
+        self._ensure_files()
+        with self._lock, open(self.data_path, "ab") as data, open(self.index_path, "r+b") as index:
+            if fcntl is not None:
+                fcntl.flock(data.fileno(), fcntl.LOCK_EX)  # released when the file closes
+            offset = data.seek(0, os.SEEK_END)
+            entries = bytearray()
+            for full_key, body in pending:
+                data.write(full_key)
+                data.write(body)
+                entries += _hash(full_key).to_bytes(8, "little") + offset.to_bytes(8, "little")
+                entries += len(full_key).to_bytes(4, "little") + len(body).to_bytes(4, "little")
+                offset += len(full_key) + len(body)
+            data.flush()
+            # Drop a torn entry left by a writer that died mid-append
+            end = index.seek(0, os.SEEK_END)
+            if end % _ENTRY_SIZE:
+                index.truncate(end - end % _ENTRY_SIZE)
+                index.seek(0, os.SEEK_END)
+            index.write(entries)
+        return len(pending)
+
+    def put(self, key: str, text: str, kind: str = ABSTRACT) -> bool:
+        return self.put_many([(key, text)], kind) == 1
+
+    def __len__(self) -> int:
+        self._ensure_files()
+        return os.path.getsize(self.index_path) // _ENTRY_SIZE
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_files()
+        return {
+            "records": len(self),
+            "data_bytes": os.path.getsize(self.data_path),
+            "mapped_records": self._n,
+        }
+
+
+corpus = Corpus()
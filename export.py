@@ -0,0 +1,236 @@
+"""
+Streaming exporters for paper lists: JSON, JSONL, CSV, BibTeX, RIS, Markdown and TXT.
+
+Every writer takes an iterable of papers (Paper objects or entry dicts) and
+yields text one paper at a time, so nothing is serialized until a download is
+actually requested and a reading list or harvest file of any size is written
+without holding the whole output in memory.
+
+    python export.py harvest.jsonl.gz --format bibtex -o papers.bib
+"""
+import argparse
+import csv
+import io
+import json
+import re
+import sys
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from identity import arxiv_key
+
+CSV_COLUMNS = ("id", "title", "authors", "published", "updated", "categories", "pdf", "summary")
+
+# Chunks handed to an HTTP response or file are grouped to about this many characters
+_CHUNK_CHARS = 64 * 1024
+
+
+def _entry(paper: Any) -> Dict[str, Any]:
+    return paper.to_dict() if hasattr(paper, "to_dict") else paper
+
+
+def _year(entry: Dict[str, Any]) -> str:
+    return (entry.get("published") or entry.get("updated") or "")[:4]
+
+
+_INDENTED = json.JSONEncoder(indent=2)
+
+
+def iter_json(papers: Iterable[Any]) -> Iterator[str]:
+    """Same text json.dumps(list, indent=2) produces, one element at a time."""
+    first = True
+    for paper in papers:
+        body = _INDENTED.encode(_entry(paper)).replace("\n", "\n  ")
+        yield ("[\n  " if first else ",\n  ") + body
+        first = False
+    yield "[]" if first else "\n]"
+
+
+def iter_jsonl(papers: Iterable[Any]) -> Iterator[str]:
+    for paper in papers:
+        yield json.dumps(_entry(paper)) + "\n"
+
+
+def iter_csv(papers: Iterable[Any]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def row(values) -> str:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow(values)
+        return buf.getvalue()
+
+    yield row(CSV_COLUMNS)
+    for paper in papers:
+        e = _entry(paper)
+        yield row([
+            e.get("id") or "", e.get("title") or "", "; ".join(e.get("authors") or []),
+            e.get("published") or "", e.get("updated") or "", " ".join(e.get("categories") or []),
+            e.get("pdf") or "", e.get("summary") or "",
+        ])
+
+
+def _bib_value(text: str) -> str:
+    # arXiv metadata is already LaTeX-ish ($...$, \emph{}), so keep it; escape bare
+    # specials and drop braces that would leave the field unbalanced
+    text = re.sub(r"(?<!\\)([&%#])", r"\\\1", " ".join((text or "").split()))
+    out, depth = [], 0
+    for ch in text:
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            if depth == 0:
+                continue
+            depth -= 1
+        out.append(ch)
+    return " ".join("".join(out).split()) + "}" * depth
+
+
+def _ascii_word(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^A-Za-z0-9]", "", text)
+
+
+def _bib_key(entry: Dict[str, Any]) -> str:
+    authors = entry.get("authors") or []
+    surname = _ascii_word(authors[0].split()[-1]).lower() if authors and authors[0].split() else "anon"
+    words = [w for w in (_ascii_word(w) for w in (entry.get("title") or "").split()) if len(w) > 3]
+    return f"{surname or 'anon'}{_year(entry)}{words[0].lower() if words else ''}"
+
+
+def iter_bibtex(papers: Iterable[Any]) -> Iterator[str]:
+    used: Dict[str, int] = {}
+    for paper in papers:
+        e = _entry(paper)
+        key = _bib_key(e)
+        n = used.get(key, 0)
+        used[key] = n + 1
+        if n:
+            key += chr(ord("a") + n - 1) if n <= 26 else str(n)
+        fields = [("title", f"{{{_bib_value(e.get('title'))}}}"),
+                  ("author", _bib_value(" and ".join(e.get("authors") or [])))]
+        if _year(e):
+            fields.append(("year", _year(e)))
+        if e.get("id"):
+            fields += [("eprint", arxiv_key(e["id"])), ("archivePrefix", "arXiv")]
+        if e.get("categories"):
+            fields.append(("primaryClass", e["categories"][0]))
+        if e.get("id") or e.get("pdf"):
+            fields.append(("url", e.get("id") or e.get("pdf")))
+        if e.get("summary"):
+            fields.append(("abstract", _bib_value(e["summary"])))
+        body = ",\n".join(f"  {name} = {{{value}}}" for name, value in fields)
+        yield f"@misc{{{key},\n{body}\n}}\n\n"
+
+
+def iter_ris(papers: Iterable[Any]) -> Iterator[str]:
+    # RIS lines are "TAG  - value", records end with "ER  - "; the spec asks for CRLF
+    for paper in papers:
+        e = _entry(paper)
+        lines = ["TY  - UNPB", f"TI  - {' '.join((e.get('title') or '').split())}"]
+        lines += [f"AU  - {a}" for a in e.get("authors") or []]
+        if _year(e):
+            lines.append(f"PY  - {_year(e)}")
+        if e.get("published"):
+            lines.append(f"DA  - {e['published'][:10].replace('-', '/')}")
+        if e.get("summary"):
+            lines.append(f"AB  - {' '.join(e['summary'].split())}")
+        lines += [f"KW  - {c}" for c in e.get("categories") or []]
+        if e.get("id"):
+            lines += [f"UR  - {e['id']}", f"M1  - arXiv:{arxiv_key(e['id'])}"]
+        if e.get("pdf"):
+            lines.append(f"L1  - {e['pdf']}")
+        lines.append("ER  - ")
+        yield "\r\n".join(lines) + "\r\n\r\n"
+
+
+def iter_markdown(papers: Iterable[Any]) -> Iterator[str]:
+    for i, paper in enumerate(papers, 1):
+        e = _entry(paper)
+        parts = [f"## {i}. {' '.join((e.get('title') or '').split())}\n"]
+        if e.get("authors"):
+            parts.append(f"**Authors:** {', '.join(e['authors'])}  ")
+        if e.get("published"):
+            parts.append(f"**Published:** {e['published'][:10]}  ")
+        if e.get("categories"):
+            parts.append(f"**Categories:** {', '.join(e['categories'])}  ")
+        if e.get("pdf"):
+            parts.append(f"**PDF:** [{e['pdf']}]({e['pdf']})  ")
+        if e.get("summary"):
+            parts.append("\n> " + " ".join(e["summary"].split()))
+        yield "\n".join(parts) + "\n\n"
+
+
+def iter_txt(papers: Iterable[Any]) -> Iterator[str]:
+    # The plain-text layout the Streamlit download has always used
+    first = True
+    for paper in papers:
+        e = _entry(paper)
+        text = (f"Title: {e.get('title')}\nAuthors: {', '.join(e.get('authors') or [])}\n"
+                f"Summary: {e.get('summary')}\nPDF: {e.get('pdf')}\n")
+        yield text if first else "\n\n" + text
+        first = False
+
+
+# format -> (writer, media type, file extension)
+FORMATS: Dict[str, Tuple[Callable[[Iterable[Any]], Iterator[str]], str, str]] = {
+    "json": (iter_json, "application/json", "json"),
+    "jsonl": (iter_jsonl, "application/x-ndjson", "jsonl"),
+    "csv": (iter_csv, "text/csv", "csv"),
+    "bibtex": (iter_bibtex, "application/x-bibtex", "bib"),
+    "ris": (iter_ris, "application/x-research-info-systems", "ris"),
+    "markdown": (iter_markdown, "text/markdown", "md"),
+    "txt": (iter_txt, "text/plain", "txt"),
+}
+
+
+def export(papers: Iterable[Any], fmt: str, chunk_chars: int = _CHUNK_CHARS) -> Iterator[str]:
+    """Serialize papers lazily in `fmt`, yielding chunks of roughly `chunk_chars` characters."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(FORMATS)})")
+    buf, size = [], 0
+    for piece in FORMATS[fmt][0](papers):
+        buf.append(piece)
+        size += len(piece)
+        if size >= chunk_chars:
+            yield "".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf)
+
+
+def export_filename(stem: str, fmt: str) -> str:
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", stem).strip("_") or "papers"
+    return f"{stem}.{FORMATS[fmt][2]}"
+
+
+def write_export(papers: Iterable[Any], fmt: str, path: Optional[str] = None) -> int:
+    """Write an export to `path` (stdout if None). Returns characters written."""
+    out = open(path, "w", encoding="utf-8", newline="") if path else sys.stdout
+    written = 0
+    try:
+        for chunk in export(papers, fmt):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if path:
+            out.close()
+    return written
+
+
+def main():
+    from harvest import read_harvest
+
+    parser = argparse.ArgumentParser(description="Export a harvest file (gzip JSONL) to another format")
+    parser.add_argument("input", help="harvest output, e.g. harvest.jsonl.gz")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="bibtex")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args()
+    written = write_export(read_harvest(args.input), args.format, args.output)
+    if args.output:
+        print(f"Wrote {written} characters to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Client-side filter/sort engine for a session's result list.
+
+Everything the result view filters or sorts on is computed once, when the
+results arrive: publication day ordinals, a lowercased author string and a
+category bitset per paper. A filter request is then one pass over those
+precomputed keys, and repeated requests (Streamlit reruns on every widget
+interaction) are served from a small memo.
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from paper import Paper
+
+SORT_NEWEST = "newest"
+SORT_OLDEST = "oldest"
+
+# Separates authors in the joined key; cannot appear in a stripped needle
+_AUTHOR_SEP = "\n"
+_MEMO_SIZE = 32
+
+
+class FilterIndex:
+    def __init__(self, papers: Sequence[Paper]):
+        self.papers = papers if isinstance(papers, list) else list(papers)
+        self._cat_bits: Dict[str, int] = {}
+        self._day: List[Optional[int]] = []  # date ordinal of published (or updated)
+        self._ts: List[float] = []  # sort key: published timestamp, -inf when missing
+        self._authors: List[str] = []
+        self._cats: List[int] = []
+        for p in self.papers:
+            when = p.published or p.updated
+            self._day.append(when.date().toordinal() if when else None)
+            self._ts.append(p.published.timestamp() if p.published else float("-inf"))
+            self._authors.append(_AUTHOR_SEP.join(a.lower() for a in p.authors))
+            self._cats.append(self._mask(p.categories, grow=True))
+        self._memo: Dict[tuple, List[Paper]] = {}
+
+    def _mask(self, categories: Iterable[str], grow: bool = False) -> int:
+        mask = 0
+        for c in categories:
+            bit = self._cat_bits.get(c)
+            if bit is None:
+                if not grow:
+                    continue
+                bit = self._cat_bits[c] = 1 << len(self._cat_bits)
+            mask |= bit
+        return mask
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def apply(
+        self,
+        days: Optional[int] = None,
+        author: str = "",
+        categories: Iterable[str] = (),
+        sort: Optional[str] = None,
+        today: Optional[date] = None,
+    ) -> List[Paper]:
+        """Papers published within `days`, with an author containing `author`, in any of
+        `categories`, optionally sorted newest/oldest first. Papers without a date pass
+        the date filter; ties keep their original (relevance) order."""
+        today = today or date.today()
+        needle = (author or "").strip().lower()
+        categories = tuple(categories or ())
+        key = (days, needle, categories, sort, today.toordinal())
+        hit = self._memo.get(key)
+        if hit is not None:
+            return hit
+
+        cutoff = today.toordinal() - days if days else None
+        want = self._mask(categories) if categories else None
+        keep = []
+        for i in range(len(self.papers)):
+            if cutoff is not None:
+                day = self._day[i]
+                if day is not None and day < cutoff:
+                    continue
+            if needle and needle not in self._authors[i]:
+                continue
+            if want is not None and not (self._cats[i] & want):
+                continue
+            keep.append(i)
+        if sort == SORT_NEWEST:
+            keep.sort(key=self._ts.__getitem__, reverse=True)
+        elif sort == SORT_OLDEST:
+            keep.sort(key=self._ts.__getitem__)
+        out = [self.papers[i] for i in keep]
+
+        if len(self._memo) >= _MEMO_SIZE:
+            self._memo.pop(next(iter(self._memo)))
+        self._memo[key] = out
+        return out
+
+
+def filter_papers(papers: Sequence[Paper], **kwargs) -> List[Paper]:
+    """One-off convenience wrapper; keep a FilterIndex around when filtering the same list repeatedly."""
+    return FilterIndex(papers).apply(**kwargs)
@@ -0,0 +1,343 @@
+"""
+Bulk arXiv metadata harvesting over OAI-PMH.
+
+Pulls whole sets (e.g. all of cs for a year, narrowed to cs.LG) with
+ListRecords and resumption tokens, parses each response as it streams in and
+appends records as gzip-compressed JSON lines. After every page a checkpoint
+(resumption token + output size) is written, so a crashed or interrupted run
+picks up exactly where it stopped.
+
+    python harvest.py harvest --set cs --category cs.LG --from 2024-01-01 --until 2024-12-31 --out cs_lg_2024.jsonl.gz
+    python harvest.py harvest ... --record recordings/      # also save raw responses
+    python harvest.py serve recordings/ --port 8099         # replay them offline
+    python harvest.py harvest ... --base-url http://127.0.0.1:8099/oai2 --min-interval 0
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from rate_limit import PRIORITY_BACKGROUND, RateLimiter
+
+OAI_BASE_URL = "http://export.arxiv.org/oai2"
+_OAI = "{http://www.openarchives.org/OAI/2.0/}"
+_ARXIV = "{http://arxiv.org/OAI/arXiv/}"
+_MAX_RETRIES = 5
+_DEFAULT_RETRY_AFTER = 10  # seconds, when a 503 has no usable Retry-After
+
+
+def _retry_after(value: Optional[str], default: int = _DEFAULT_RETRY_AFTER) -> int:
+    """Seconds to wait from a Retry-After header: delay-seconds or an HTTP-date."""
+    value = (value or "").strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0, int((when - datetime.now(timezone.utc)).total_seconds()))
+
+
+def _record_to_dict(record: ET.Element) -> Optional[Dict[str, Any]]:
+    """arXiv-format OAI record -> the same entry shape parse_arxiv_xml produces. None if deleted."""
+    header = record.find(_OAI + "header")
+    if header is not None and header.attrib.get("status") == "deleted":
+        return None
+    meta = record.find(f"{_OAI}metadata/{_ARXIV}arXiv")
+    if meta is None:
+        return None
+    arxiv_id = (meta.findtext(_ARXIV + "id") or "").strip()
+    authors = []
+    for a in meta.iterfind(f"{_ARXIV}authors/{_ARXIV}author"):
+        name = " ".join(p for p in (a.findtext(_ARXIV + "forenames"), a.findtext(_ARXIV + "keyname")) if p)
+        authors.append(name)
+    created = meta.findtext(_ARXIV + "created")
+    return {
+        "id": f"http://arxiv.org/abs/{arxiv_id}",
+        "arxiv_id": arxiv_id,
+        "version": None,  # OAI metadata describes the latest version without numbering it
+        "title": " ".join((meta.findtext(_ARXIV + "title") or "").split()),
+        "summary": (meta.findtext(_ARXIV + "abstract") or "").strip(),
+        "authors": authors,
+        "categories": (meta.findtext(_ARXIV + "categories") or "").split(),
+        "pdf": f"http://arxiv.org/pdf/{arxiv_id}",
+        "published": f"{created}T00:00:00Z" if created else None,
+        "updated": f"{meta.findtext(_ARXIV + 'updated')}T00:00:00Z" if meta.findtext(_ARXIV + "updated") else None,
+    }
+
+
+class ListRecordsParser:
+    """Push-style parser for one ListRecords response; finished records are dropped from the tree."""
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack: List[ET.Element] = []
+        self.resumption_token: Optional[str] = None
+        self.complete_list_size: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def feed(self, chunk: Union[bytes, str]) -> List[Dict[str, Any]]:
+        if not chunk:
+            return []
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[Dict[str, Any]]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        out = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._stack.append(elem)
+                continue
+            self._stack.pop()
+            if elem.tag == _OAI + "record":
+                entry = _record_to_dict(elem)
+                if entry is not None:
+                    out.append(entry)
+                elem.clear()
+                if self._stack:
+                    self._stack[-1].remove(elem)
+            elif elem.tag == _OAI + "resumptionToken":
+                self.resumption_token = (elem.text or "").strip() or None
+                size = elem.attrib.get("completeListSize")
+                self.complete_list_size = int(size) if size and size.isdigit() else None
+            elif elem.tag == _OAI + "error":
+                self.error = f"{elem.attrib.get('code')}: {(elem.text or '').strip()}"
+        return out
+
+
+class Harvester:
+    def __init__(
+        self,
+        out_path: str,
+        base_url: str = OAI_BASE_URL,
+        set_spec: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_until: Optional[str] = None,
+        categories: Iterable[str] = (),
+        limiter: Optional[RateLimiter] = None,
+        record_dir: Optional[str] = None,
+    ):
+        self.out_path = out_path
+        self.checkpoint_path = out_path + ".checkpoint.json"
+        self.base_url = base_url
+        self.set_spec = set_spec
+        self.date_from = date_from
+        self.date_until = date_until
+        self.categories = set(categories)
+        self.limiter = limiter
+        self.record_dir = record_dir
+        self._session = requests.Session()
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        if not os.path.exists(self.checkpoint_path):
+            return {"token": None, "pages": 0, "records": 0, "bytes": 0, "done": False}
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, state: Dict[str, Any]) -> None:
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_path)
+
+    def _params(self, token: Optional[str]) -> Dict[str, str]:
+        # A resumption token replaces every other argument
+        if token:
+            return {"verb": "ListRecords", "resumptionToken": token}
+        params = {"verb": "ListRecords", "metadataPrefix": "arXiv"}
+        if self.set_spec:
+            params["set"] = self.set_spec
+        if self.date_from:
+            params["from"] = self.date_from
+        if self.date_until:
+            params["until"] = self.date_until
+        return params
+
+    def _fetch_page(self, token: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Yield one page's records as they stream in; afterwards self._page holds the parser."""
+        for attempt in range(_MAX_RETRIES):
+            if self.limiter is not None:
+                self.limiter.acquire(PRIORITY_BACKGROUND)
+            resp = self._session.get(self.base_url, params=self._params(token), timeout=120, stream=True)
+            if resp.status_code == 503:
+                # OAI-PMH flow control: come back after Retry-After seconds
+                wait = _retry_after(resp.headers.get("Retry-After"))
+                resp.close()
+                print(f"OAI server busy, retrying in {wait}s ({attempt + 1}/{_MAX_RETRIES})")
+                time.sleep(wait)
+                continue
+            if not resp.ok:
+                raise ValueError(f"Bad response from OAI-PMH: {resp.status_code} - {resp.text[:500]}")
+            break
+        else:
+            raise ValueError("OAI-PMH server kept answering 503")
+
+        parser = ListRecordsParser()
+        self._page = parser
+        raw = [] if self.record_dir else None
+        with resp:
+            for chunk in resp.iter_content(chunk_size=65536):
+                if raw is not None:
+                    raw.append(chunk)
+                yield from parser.feed(chunk)
+        yield from parser.close()
+        if raw is not None:
+            self._record(token, b"".join(raw))
+
+    def _record(self, token: Optional[str], body: bytes) -> None:
+        os.makedirs(self.record_dir, exist_ok=True)
+        index_path = os.path.join(self.record_dir, "index.json")
+        index = {}
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        name = f"page_{len(index):05d}.xml"
+        with open(os.path.join(self.record_dir, name), "wb") as f:
+            f.write(body)
+        index[token or ""] = name
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+
+    def run(self, max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """Harvest until the list is exhausted (or max_pages more pages). Returns the checkpoint state."""
+        state = self._load_checkpoint()
+        if state["done"]:
+            return state
+        # Drop anything written after the last checkpoint (a page cut short by a crash)
+        if os.path.exists(self.out_path):
+            with open(self.out_path, "r+b") as f:
+                f.truncate(state["bytes"])
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            kept = []
+            for entry in self._fetch_page(state["token"]):
+                if not self.categories or self.categories.intersection(entry["categories"]):
+                    kept.append(json.dumps(entry, separators=(",", ":")))
+            if self._page.error and not self._page.error.startswith("noRecordsMatch"):
+                raise ValueError(f"OAI-PMH error: {self._page.error}")
+            if kept:
+                # One gzip member per page; concatenated members read back as one stream
+                with open(self.out_path, "ab") as f:
+                    f.write(gzip.compress(("\n".join(kept) + "\n").encode("utf-8")))
+                    f.flush()
+                    os.fsync(f.fileno())
+            pages += 1
+            state = {
+                "token": self._page.resumption_token,
+                "pages": state["pages"] + 1,
+                "records": state["records"] + len(kept),
+                "bytes": os.path.getsize(self.out_path) if os.path.exists(self.out_path) else 0,
+                "done": self._page.resumption_token is None,
+                "complete_list_size": self._page.complete_list_size,
+            }
+            self._save_checkpoint(state)
+            print(f"Page {state['pages']}: kept {len(kept)}, total {state['records']} records")
+            if state["done"]:
+                break
+        return state
+
+
+def read_harvest(path: str) -> Iterator[Dict[str, Any]]:
+    """Iterate the records of a harvest output file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def serve_recordings(record_dir: str, host: str = "127.0.0.1", port: int = 8099) -> ThreadingHTTPServer:
+    """Stand-in OAI-PMH server replaying responses saved with --record, keyed by resumption token."""
+    with open(os.path.join(record_dir, "index.json"), encoding="utf-8") as f:
+        index = json.load(f)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            token = parse_qs(urlparse(self.path).query).get("resumptionToken", [""])[0]
+            name = index.get(token)
+            if name is None:
+                self.send_error(404, f"No recording for resumptionToken={token!r}")
+                return
+            with open(os.path.join(record_dir, name), "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk arXiv metadata harvest over OAI-PMH")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    h = sub.add_parser("harvest", help="harvest (or resume) into a .jsonl.gz file")
+    h.add_argument("--out", required=True)
+    h.add_argument("--set", dest="set_spec", help="OAI set, e.g. cs, math, physics:hep-th")
+    h.add_argument("--category", action="append", default=[], help="keep only these categories (repeatable)")
+    h.add_argument("--from", dest="date_from", help="YYYY-MM-DD")
+    h.add_argument("--until", dest="date_until", help="YYYY-MM-DD")
+    h.add_argument("--base-url", default=OAI_BASE_URL)
+    h.add_argument("--min-interval", type=float, default=float(os.getenv("ARXIV_MIN_INTERVAL", "3.0")),
+                   help="seconds between requests; 0 disables throttling (local stand-in server)")
+    h.add_argument("--max-pages", type=int)
+    h.add_argument("--record", metavar="DIR", help="save raw responses for offline replay")
+    h.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and start over")
+
+    s = sub.add_parser("serve", help="replay recorded responses as a local OAI-PMH server")
+    s.add_argument("record_dir")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8099)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        server = serve_recordings(args.record_dir, args.host, args.port)
+        print(f"Serving {args.record_dir} at http://{args.host}:{args.port}/oai2")
+        server.serve_forever()
+        return
+
+    harvester = Harvester(
+        args.out,
+        base_url=args.base_url,
+        set_spec=args.set_spec,
+        date_from=args.date_from,
+        date_until=args.date_until,
+        categories=args.category,
+        limiter=RateLimiter(
+            rate=1.0 / args.min_interval, burst=1.0, path=os.getenv("ARXIV_RATE_LIMIT_PATH") or None, name="arxiv"
+        ) if args.min_interval > 0 else None,
+        record_dir=args.record,
+    )
+    if args.restart:
+        for p in (harvester.out_path, harvester.checkpoint_path):
+            if os.path.exists(p):
+                os.remove(p)
+    t0 = time.time()
+    state = harvester.run(max_pages=args.max_pages)
+    print(f"{'Done' if state['done'] else 'Paused'}: {state['records']} records in {state['pages']} pages "
+          f"({time.time() - t0:.1f}s this run) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Paper identity: arXiv ids and versions, exact dedupe and near-duplicate titles.
+
+arXiv serves one paper under several versioned ids (2401.01234v1, v2, ...)
+and the same paper reaches us through several searches and alert watches.
+Entries are keyed by their unversioned arXiv id (or, without one, by their
+normalized title) in a hash index, so dropping a repeat is one dict lookup.
+Different papers with near-identical titles (re-submissions, errata, the odd
+copy under a new id) are kept but flagged, using MinHash signatures of title
+shingles bucketed with LSH so each check only compares against a few
+candidates instead of every title seen.
+"""
+import operator
+import random
+import re
+import unicodedata
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# New style (2401.01234) and old style (hep-th/9901001) ids, optionally inside an abs/pdf link
+_ARXIV_ID_RE = re.compile(
+    r"^(?:https?://)?(?:www\.|export\.)?(?:arxiv\.org/(?:abs|pdf)/)?"
+    r"(\d{4}\.\d{4,5}|[a-z-]+(?:\.[A-Z]{2})?/\d{7})(?:v(\d+))?(?:\.pdf)?$"
+)
+
+NEAR_DUPLICATE_THRESHOLD = 0.8  # estimated Jaccard similarity of title shingles
+_SHINGLE = 4  # characters per title shingle
+_BANDS, _ROWS = 16, 4  # LSH over 64 hash functions
+_MIN_SHARED_BANDS = 2  # candidates must collide in this many bands (~99.8% recall at 0.8, ~26% of pairs at 0.5)
+# Multiply-shift hashing of 32-bit shingle hashes: (a * h + b) mod 2**64, top 32 bits; a is odd
+_rng = random.Random(20240101)
+_HASH_A = [_rng.getrandbits(64) | 1 for _ in range(_BANDS * _ROWS)]
+_HASH_B = [_rng.getrandbits(64) for _ in range(_BANDS * _ROWS)]
+_hash_params = None  # the same as numpy columns, built on first use
+
+
+def parse_arxiv_id(value: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """('2401.01234', 2) from '2401.01234v2' or an abs/pdf link; (None, None) if not an arXiv id."""
+    m = _ARXIV_ID_RE.match((value or "").strip())
+    if not m:
+        return None, None
+    return m.group(1), int(m.group(2)) if m.group(2) else None
+
+
+def arxiv_key(value: str) -> str:
+    """The (versioned) arXiv id from an abs/pdf link, else the value unchanged."""
+    value = (value or "").strip()
+    base, version = parse_arxiv_id(value)
+    if base is None:
+        return value
+    return f"{base}v{version}" if version else base
+
+
+def entry_arxiv_id(entry: Dict[str, Any]) -> Tuple[Optional[str], Optional[int]]:
+    """arXiv id and version of an entry, from its id or else its PDF link."""
+    if entry.get("arxiv_id"):
+        return entry["arxiv_id"], entry.get("version")
+    for field in ("id", "pdf"):
+        base, version = parse_arxiv_id(entry.get(field))
+        if base:
+            return base, version
+    return None, None
+
+
+def normalize_title(title: str) -> str:
+    text = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode("ascii").lower()
+    text = re.sub(r"\\[a-z]+|[^a-z0-9]+", " ", text)  # LaTeX commands and punctuation
+    return " ".join(text.split())
+
+
+def paper_key(entry: Dict[str, Any]) -> Optional[str]:
+    """One key per paper across versions: the unversioned arXiv id, else the normalized title."""
+    base, _ = entry_arxiv_id(entry)
+    if base:
+        return base
+    title = normalize_title(entry.get("title") or "")
+    return f"title:{title}" if title else None
+
+
+def title_signature(title: str) -> Optional[Tuple[int, ...]]:
+    """MinHash signature of a title's character shingles (None for an empty title)."""
+    global _hash_params
+    import numpy as np
+
+    text = normalize_title(title)
+    if not text:
+        return None
+    if _hash_params is None:
+        _hash_params = (np.array(_HASH_A, dtype=np.uint64)[:, None], np.array(_HASH_B, dtype=np.uint64)[:, None], np.uint64(32))
+    a, b, shift = _hash_params
+    grams = {text[i:i + _SHINGLE] for i in range(max(1, len(text) - _SHINGLE + 1))}
+    h = np.array([zlib.crc32(g.encode("ascii")) for g in grams], dtype=np.uint64)
+    return tuple(((a * h + b) >> shift).min(axis=1).tolist())
+
+
+def signature_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: the share of hash functions whose minimum agrees."""
+    return sum(map(operator.eq, a, b)) / len(a)
+
+
+class Deduper:
+    """Drops repeats (same paper, any version) and flags near-duplicate titles.
+
+    `entries` holds what was kept, in arrival order; when a newer version of a
+    kept paper arrives its fields replace the older one's in place.
+    """
+
+    def __init__(self, near_threshold: Optional[float] = NEAR_DUPLICATE_THRESHOLD):
+        self.near_threshold = near_threshold
+        self.entries: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}  # paper_key -> position in entries
+        self._signatures: List[Optional[Tuple[int, ...]]] = []
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, entry: Dict[str, Any]) -> bool:
+        return paper_key(entry) in self._index
+
+    def kept(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The entry kept for the same paper, if any."""
+        pos = self._index.get(paper_key(entry))
+        return None if pos is None else self.entries[pos]
+
+    def add(self, entry: Dict[str, Any]) -> bool:
+        """Keep `entry` unless it is a paper already seen. Returns True if it was kept."""
+        key = paper_key(entry)
+        if key is None:
+            self.entries.append(entry)
+            self._signatures.append(None)
+            return True
+        pos = self._index.get(key)
+        if pos is not None:
+            _, version = entry_arxiv_id(entry)
+            _, kept_version = entry_arxiv_id(self.entries[pos])
+            if version and kept_version and version > kept_version:
+                # Annotations on the kept entry (flags, alert matches) carry over
+                self.entries[pos] = {**self.entries[pos], **entry}
+            return False
+        pos = self._index[key] = len(self.entries)
+        self.entries.append(entry)
+        sig = title_signature(entry.get("title") or "") if self.near_threshold is not None else None
+        self._signatures.append(sig)
+        if sig is not None:
+            self._flag_near_duplicate(pos, entry, sig)
+        return True
+
+    def _flag_near_duplicate(self, pos: int, entry: Dict[str, Any], sig: Tuple[int, ...]) -> None:
+        shared: Dict[int, int] = {}
+        for band in range(_BANDS):
+            bucket = self._buckets.setdefault((band, sig[band * _ROWS:(band + 1) * _ROWS]), [])
+            for other in bucket:
+                shared[other] = shared.get(other, 0) + 1
+            bucket.append(pos)
+        # Pairs at the threshold share several bands; one shared band is mostly chance
+        best, best_sim = None, self.near_threshold
+        for other, bands in shared.items():
+            if bands < _MIN_SHARED_BANDS:
+                continue
+            sim = signature_similarity(sig, self._signatures[other])
+            if sim > best_sim or (sim == best_sim and best is None):
+                best, best_sim = other, sim
+        if best is not None:
+            original = self.entries[best]
+            entry["near_duplicate_of"] = (
+                original.get("near_duplicate_of") or entry_arxiv_id(original)[0] or original.get("id") or original.get("title")
+            )
+
+    def filter(self, entries: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield only the entries that are new to this deduper."""
+        for entry in entries:
+            if self.add(entry):
+                yield entry
+
+
+def dedupe(entries: Iterable[Dict[str, Any]], near_threshold: Optional[float] = NEAR_DUPLICATE_THRESHOLD) -> List[Dict[str, Any]]:
+    """One entry per paper (its newest version), in first-seen order, near-duplicate titles flagged."""
+    d = Deduper(near_threshold)
+    for entry in entries:
+        d.add(entry)
+    return d.entries
@@ -0,0 +1,178 @@
+"""
+Persistent local full-text index over every paper fetched from arXiv.
+
+Postings live in SQLite so the index survives restarts and is shared by all
+worker processes. Queries are ranked with BM25, scored per field (title,
+summary) with configurable boosts. With a corpus attached, abstracts are kept
+in the memory-mapped corpus and only metadata is stored per row. Rows are keyed
+by paper (identity.paper_key), so indexing v2 of a paper replaces v1.
+"""
+import heapq
+import json
+import math
+import sqlite3
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from ai_services import _tokenize
+from corpus import Corpus
+from identity import dedupe, paper_key
+
+FIELDS = ("title", "summary")
+DEFAULT_BOOSTS = {"title": 2.0, "summary": 1.0}
+
+
+def _legacy_id(entry: Dict[str, Any]) -> Optional[str]:
+    # How rows were keyed before paper_key; still looked up so older indexes keep working
+    return entry.get("id") or entry.get("pdf") or entry.get("title")
+
+
+def _doc_key(doc_id: str) -> str:
+    """Row key for an id or abs/pdf link as clients send it."""
+    return paper_key({"id": doc_id}) or doc_id
+
+
+class LocalIndex:
+    def __init__(self, path: str = "local_index.db", k1: float = 1.2, b: float = 0.75, corpus: Optional[Corpus] = None):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.corpus = corpus
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS docs (
+                    doc_id TEXT PRIMARY KEY, title_len INTEGER NOT NULL, summary_len INTEGER NOT NULL, data TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL, field INTEGER NOT NULL, doc_id TEXT NOT NULL, tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, field, doc_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL NOT NULL);
+                INSERT OR IGNORE INTO meta (key, value) VALUES ('n_docs', 0), ('title_len', 0), ('summary_len', 0);
+                """
+            )
+            self._local.conn = conn
+        return conn
+
+    def _delete(self, conn: sqlite3.Connection, doc_id: str) -> bool:
+        row = conn.execute("SELECT title_len, summary_len FROM docs WHERE doc_id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+        conn.execute("UPDATE meta SET value = value - 1 WHERE key = 'n_docs'")
+        conn.execute("UPDATE meta SET value = value - ? WHERE key = 'title_len'", (row[0],))
+        conn.execute("UPDATE meta SET value = value - ? WHERE key = 'summary_len'", (row[1],))
+        return True
+
+    def add_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Index (or re-index) entries as returned by parse_arxiv_xml. Returns the count added."""
+        keyed = {}
+        for entry in entries:
+            doc_id = paper_key(entry)
+            if doc_id:
+                keyed[doc_id] = entry  # the last version in the batch wins
+        if self.corpus is not None:
+            # Texts go in first so a row is never visible without its abstract
+            self.corpus.put_many((doc_id, e.get("summary") or "") for doc_id, e in keyed.items())
+        conn = self._conn()
+        added = 0
+        with conn:
+            for doc_id, entry in keyed.items():
+                self._delete(conn, doc_id)
+                legacy = _legacy_id(entry)
+                if legacy and legacy != doc_id:
+                    self._delete(conn, legacy)
+                tokens = {f: _tokenize(entry.get(f) or "") for f in FIELDS}
+                data = {k: v for k, v in entry.items() if k != "summary"} if self.corpus is not None else entry
+                conn.execute(
+                    "INSERT INTO docs (doc_id, title_len, summary_len, data) VALUES (?, ?, ?, ?)",
+                    (doc_id, len(tokens["title"]), len(tokens["summary"]), json.dumps(data)),
+                )
+                conn.executemany(
+                    "INSERT INTO postings (term, field, doc_id, tf) VALUES (?, ?, ?, ?)",
+                    [(t, i, doc_id, tf) for i, f in enumerate(FIELDS) for t, tf in Counter(tokens[f]).items()],
+                )
+                conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'n_docs'")
+                conn.execute("UPDATE meta SET value = value + ? WHERE key = 'title_len'", (len(tokens["title"]),))
+                conn.execute("UPDATE meta SET value = value + ? WHERE key = 'summary_len'", (len(tokens["summary"]),))
+                added += 1
+        return added
+
+    def add(self, entry: Dict[str, Any]) -> bool:
+        return self.add_many([entry]) == 1
+
+    def delete(self, doc_id: str) -> bool:
+        conn = self._conn()
+        with conn:
+            deleted = self._delete(conn, _doc_key(doc_id))
+            return self._delete(conn, doc_id) or deleted
+
+    def _hydrate(self, doc_id: str, data: str) -> Dict[str, Any]:
+        entry = json.loads(data)
+        if "summary" not in entry and self.corpus is not None:
+            entry["summary"] = self.corpus.get(doc_id) or ""
+        return entry
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Entry by arXiv id (any version) or abs/pdf link, or by the key it was indexed under."""
+        conn = self._conn()
+        for key in dict.fromkeys((_doc_key(doc_id), doc_id)):
+            row = conn.execute("SELECT data FROM docs WHERE doc_id = ?", (key,)).fetchone()
+            if row:
+                return self._hydrate(key, row[0])
+        return None
+
+    def __len__(self) -> int:
+        return int(self._conn().execute("SELECT value FROM meta WHERE key = 'n_docs'").fetchone()[0])
+
+    def search(self, query: str, limit: int = 10, boosts: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """BM25-ranked search. Returns entry dicts with an added 'score' key, best first.
+
+        Near-duplicate titles carry "near_duplicate_of" pointing at the better-ranked copy.
+        """
+        boosts = {**DEFAULT_BOOSTS, **(boosts or {})}
+        conn = self._conn()
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        n_docs = meta["n_docs"]
+        if n_docs <= 0:
+            return []
+        avg_len = [max(meta["title_len"] / n_docs, 1.0), max(meta["summary_len"] / n_docs, 1.0)]
+        terms = list(dict.fromkeys(_tokenize(query)))
+        if not terms:
+            return []
+        scores: Dict[str, float] = {}
+        doc_lens: Dict[str, tuple] = {}
+        for term in terms:
+            rows = conn.execute("SELECT field, doc_id, tf FROM postings WHERE term = ?", (term,)).fetchall()
+            if not rows:
+                continue
+            df = len({r[1] for r in rows})
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            missing = [r[1] for r in rows if r[1] not in doc_lens]
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for doc_id, tl, sl in conn.execute(
+                    f"SELECT doc_id, title_len, summary_len FROM docs WHERE doc_id IN ({marks})", chunk
+                ):
+                    doc_lens[doc_id] = (tl, sl)
+            for field, doc_id, tf in rows:
+                norm = self.k1 * (1 - self.b + self.b * doc_lens[doc_id][field] / avg_len[field])
+                scores[doc_id] = scores.get(doc_id, 0.0) + boosts[FIELDS[field]] * idf * tf * (self.k1 + 1) / (tf + norm)
+        top = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+        if not top:
+            return []
+        data = dict(conn.execute(
+            f"SELECT doc_id, data FROM docs WHERE doc_id IN ({','.join('?' * len(top))})", [d for d, _ in top]
+        ).fetchall())
+        return dedupe({**self._hydrate(d, data[d]), "score": round(s, 4)} for d, s in top)
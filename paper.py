@@ -0,0 +1,91 @@
+"""
+Compact in-memory record for a parsed arXiv entry.
+
+Sessions keep many of these resident, so the record uses __slots__, stores
+authors/categories as tuples of interned strings and keeps dates as datetimes.
+Plain dicts are still used at the API boundary via to_dict()/from_dict().
+"""
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _format_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def _interned(values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    return tuple(sys.intern(v) for v in (values or ()) if v is not None)
+
+
+@dataclass(slots=True)
+class Paper:
+    title: str
+    summary: str
+    authors: Tuple[str, ...]
+    categories: Tuple[str, ...]
+    pdf: Optional[str] = None
+    published: Optional[datetime] = None
+    updated: Optional[datetime] = None
+    id: Optional[str] = None
+    arxiv_id: Optional[str] = None
+    version: Optional[int] = None
+    near_duplicate_of: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Paper":
+        return cls(
+            title=data.get("title") or "",
+            summary=data.get("summary") or "",
+            authors=_interned(data.get("authors")),
+            categories=_interned(data.get("categories")),
+            pdf=data.get("pdf"),
+            published=_parse_date(data.get("published")),
+            updated=_parse_date(data.get("updated")),
+            id=data.get("id"),
+            arxiv_id=data.get("arxiv_id"),
+            version=data.get("version"),
+            near_duplicate_of=data.get("near_duplicate_of"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "arxiv_id": self.arxiv_id,
+            "version": self.version,
+            "title": self.title,
+            "summary": self.summary,
+            "authors": list(self.authors),
+            "categories": list(self.categories),
+            "pdf": self.pdf,
+            "published": _format_date(self.published),
+            "updated": _format_date(self.updated),
+        }
+        if self.near_duplicate_of:
+            data["near_duplicate_of"] = self.near_duplicate_of
+        return data
+
+    # Read-only mapping access so templates written against entry dicts keep working
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, default)
+        return default if value is None else value
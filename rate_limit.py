@@ -0,0 +1,156 @@
+"""
+Token-bucket rate limiter for outbound arXiv traffic.
+
+The bucket lives in a small SQLite file so every thread and every uvicorn
+worker process on the host draws from the same budget. Callers queue by
+priority class (interactive ahead of background) and FIFO within a class.
+"""
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_NAMES = {"interactive": PRIORITY_INTERACTIVE, "background": PRIORITY_BACKGROUND}
+
+# Waiters that stop polling (crashed process) are ignored after this long
+_STALE_WAITER_SECONDS = 30.0
+_POLL_SECONDS = 0.25
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: float = 1.0, path: Optional[str] = None, name: str = "default"):
+        self.rate = float(rate)  # tokens per second
+        self.burst = float(burst)
+        self.path = path or os.path.join(tempfile.gettempdir(), "arxiv_ratelimit.db")
+        self.name = name
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._waiting = {p: 0 for p in PRIORITY_NAMES.values()}
+        self._acquired = {p: 0 for p in PRIORITY_NAMES.values()}
+        self._wait_total = {p: 0.0 for p in PRIORITY_NAMES.values()}
+        self._wait_max = {p: 0.0 for p in PRIORITY_NAMES.values()}
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; autocommit so transactions are explicit.
+        # The bucket file is opened by the first request that needs a token, not by the constructor
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS bucket (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS waiters (id TEXT PRIMARY KEY, name TEXT NOT NULL, priority INTEGER NOT NULL, "
+                "enqueued REAL NOT NULL, seen REAL NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO bucket (name, tokens, updated) VALUES (?, ?, ?)", (self.name, self.burst, time.time())
+            )
+            self._local.conn = conn
+        return conn
+
+    def _try_acquire(self, priority: int, waiter_id: str, enqueued: float) -> float:
+        """Take a token if it's our turn. Returns 0.0 on success, else seconds to wait."""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM waiters WHERE seen < ?", (now - _STALE_WAITER_SECONDS,))
+            conn.execute(
+                "INSERT OR REPLACE INTO waiters (id, name, priority, enqueued, seen) VALUES (?, ?, ?, ?, ?)",
+                (waiter_id, self.name, priority, enqueued, now),
+            )
+            # Someone ahead of us: a higher priority class, or earlier in our own class
+            ahead = conn.execute(
+                "SELECT COUNT(*) FROM waiters WHERE name = ? AND id != ? AND "
+                "(priority < ? OR (priority = ? AND enqueued < ?))",
+                (self.name, waiter_id, priority, priority, enqueued),
+            ).fetchone()[0]
+            tokens, updated = conn.execute("SELECT tokens, updated FROM bucket WHERE name = ?", (self.name,)).fetchone()
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if ahead == 0 and tokens >= 1.0:
+                conn.execute("UPDATE bucket SET tokens = ?, updated = ? WHERE name = ?", (tokens - 1.0, now, self.name))
+                conn.execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+                conn.execute("COMMIT")
+                return 0.0
+            conn.execute("UPDATE bucket SET tokens = ?, updated = ? WHERE name = ?", (tokens, now, self.name))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if ahead:
+            return _POLL_SECONDS
+        return max(0.01, (1.0 - tokens) / self.rate)
+
+    def _leave(self, waiter_id: str) -> None:
+        self._conn().execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+
+    def _record(self, priority: int, waited: float) -> None:
+        with self._lock:
+            self._acquired[priority] += 1
+            self._wait_total[priority] += waited
+            self._wait_max[priority] = max(self._wait_max[priority], waited)
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> float:
+        """Block until a token is available. Returns the seconds spent waiting."""
+        waiter_id, start = uuid.uuid4().hex, time.time()
+        with self._lock:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                wait = self._try_acquire(priority, waiter_id, start)
+                if wait == 0.0:
+                    break
+                time.sleep(min(wait, _POLL_SECONDS))
+        except BaseException:
+            self._leave(waiter_id)
+            raise
+        finally:
+            with self._lock:
+                self._waiting[priority] -= 1
+        waited = time.time() - start
+        self._record(priority, waited)
+        return waited
+
+    async def acquire_async(self, priority: int = PRIORITY_INTERACTIVE) -> float:
+        waiter_id, start = uuid.uuid4().hex, time.time()
+        with self._lock:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                wait = await asyncio.to_thread(self._try_acquire, priority, waiter_id, start)
+                if wait == 0.0:
+                    break
+                await asyncio.sleep(min(wait, _POLL_SECONDS))
+        except BaseException:
+            await asyncio.to_thread(self._leave, waiter_id)
+            raise
+        finally:
+            with self._lock:
+                self._waiting[priority] -= 1
+        waited = time.time() - start
+        self._record(priority, waited)
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        queued = dict(self._conn().execute(
+            "SELECT priority, COUNT(*) FROM waiters WHERE name = ? AND seen >= ? GROUP BY priority",
+            (self.name, time.time() - _STALE_WAITER_SECONDS),
+        ).fetchall())
+        out: Dict[str, Any] = {"rate_per_s": self.rate, "burst": self.burst}
+        with self._lock:
+            for label, p in PRIORITY_NAMES.items():
+                n = self._acquired[p]
+                out[label] = {
+                    "queue_depth": self._waiting[p],
+                    "queue_depth_all_workers": queued.get(p, 0),
+                    "acquired": n,
+                    "wait_avg_s": self._wait_total[p] / n if n else 0.0,
+                    "wait_max_s": self._wait_max[p],
+                }
+        return out
@@ -0,0 +1,538 @@
+"""
+Full-text ingestion for arXiv PDFs.
+
+Each PDF is downloaded once over a pooled session, stored under its content
+hash, and extracted page by page (pypdf parses pages lazily, so a page is only
+decoded when it is read). The extracted text is split into sections and
+cached next to the PDF, so a paper is downloaded and parsed at most once no
+matter how many questions are asked about it.
+
+Extraction is CPU-bound, so request handlers hand it to `extraction_pool`: a
+bounded queue in front of a ProcessPoolExecutor whose workers run with a page
+cap, a per-job time limit and (on Unix) an address-space limit, and are
+recycled after a number of jobs.
+
+    pdf_cache/
+        index.db                 url -> sha256
+        blobs/ab/abcd....pdf     the PDF, content addressed
+        text/abcd....json.gz     extracted pages + sections
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import signal
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ai_services import _tokenize
+from corpus import FULLTEXT, Corpus, corpus
+
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "pdf_cache")
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", str(50 * 1024 * 1024)))
+_DOWNLOAD_LOCK_STRIPES = 64
+# Characters of full text handed to an LLM alongside the abstract
+PDF_CONTEXT_CHARS = int(os.getenv("PDF_CONTEXT_CHARS", "12000"))
+# Seconds a chat request waits for full text before answering from the abstract
+PDF_CHAT_WAIT = float(os.getenv("PDF_CHAT_WAIT", "10"))
+# Bump when extraction or sectioning changes so cached text is rebuilt
+EXTRACT_VERSION = "1"
+
+# Extraction pool limits
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0")) or (os.cpu_count() or 1)
+PDF_QUEUE_SIZE = int(os.getenv("PDF_QUEUE_SIZE", "256"))  # jobs queued or running
+PDF_JOB_TIMEOUT = float(os.getenv("PDF_JOB_TIMEOUT", "120"))  # seconds of extraction per PDF
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "100"))
+PDF_WORKER_MAX_MB = int(os.getenv("PDF_WORKER_MAX_MB", "2048"))  # address space per worker, 0 = unlimited
+PDF_WORKER_MAX_TASKS = int(os.getenv("PDF_WORKER_MAX_TASKS", "50"))  # jobs before a worker is replaced
+
+# Pooled keep-alive connections; PDFs come from a handful of hosts
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# "3 Method", "4.2 Results", "A Proofs", "Abstract", "REFERENCES" ...
+_HEADING_RE = re.compile(
+    r"^(?:(?:\d{1,2}(?:\.\d{1,2})*|[A-Z]|[IVX]{1,5})\.?\s+[A-Z][^\n]{1,70}"
+    r"|abstract|introduction|related work|background|method(?:s|ology)?|experiments?|results|discussion"
+    r"|conclusions?|acknowledge?ments?|references|bibliography|appendix)$",
+    re.IGNORECASE,
+)
+_TRAILING_SECTIONS = {"references", "bibliography", "acknowledgments", "acknowledgements"}
+
+
+def _pdf_url(url: str) -> str:
+    # An arXiv abs link points at the same paper as its PDF
+    return url.replace("/abs/", "/pdf/")
+
+
+class PdfCache:
+    def __init__(self, root: str = PDF_CACHE_DIR):
+        self.root = root
+        self._local = threading.local()
+        self._locks = [threading.Lock() for _ in range(_DOWNLOAD_LOCK_STRIPES)]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+            os.makedirs(os.path.join(self.root, "text"), exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.root, "index.db"), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, sha256 TEXT NOT NULL, size INTEGER NOT NULL, fetched REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _lock(self, key: str) -> threading.Lock:
+        # Single-flight: concurrent requests for one URL wait for the first download.
+        # A fixed set of striped locks, so memory stays flat however many URLs pass through
+        return self._locks[zlib.crc32(key.encode("utf-8")) % len(self._locks)]
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "blobs", sha256[:2], sha256 + ".pdf")
+
+    def text_path(self, sha256: str, max_pages: Optional[int] = None) -> str:
+        suffix = f"-p{max_pages}" if max_pages else ""
+        return os.path.join(self.root, "text", f"{sha256}-v{EXTRACT_VERSION}{suffix}.json.gz")
+
+    def lookup(self, url: str) -> Optional[str]:
+        row = self._conn().execute("SELECT sha256 FROM urls WHERE url = ?", (url,)).fetchone()
+        if row and os.path.exists(self.blob_path(row[0])):
+            return row[0]
+        return None
+
+    def download(self, url: str) -> str:
+        """Fetch a PDF (at most once per URL) and return its sha256."""
+        url = _pdf_url(url)
+        sha = self.lookup(url)
+        if sha:
+            return sha
+        with self._lock(url):
+            sha = self.lookup(url)
+            if sha:
+                return sha
+            print(f"Downloading PDF: {url}")
+            digest = hashlib.sha256()
+            size = 0
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as f, _session.get(url, timeout=60, stream=True) as resp:
+                    if not resp.ok:
+                        raise ValueError(f"PDF download failed: {resp.status_code} {url}")
+                    for chunk in resp.iter_content(chunk_size=256 * 1024):
+                        size += len(chunk)
+                        if size > MAX_PDF_BYTES:
+                            raise ValueError(f"PDF larger than {MAX_PDF_BYTES} bytes: {url}")
+                        digest.update(chunk)
+                        f.write(chunk)
+                sha = digest.hexdigest()
+                path = self.blob_path(sha)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO urls (url, sha256, size, fetched) VALUES (?, ?, ?, ?)",
+                    (url, sha, size, time.time()),
+                )
+            return sha
+
+    def load_text(self, sha256: str, max_pages: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        path = self.text_path(sha256, max_pages)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_text(self, sha256: str, doc: Dict[str, Any], max_pages: Optional[int] = None) -> None:
+        path = self.text_path(sha256, max_pages)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + f".{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(doc, f)
+        os.replace(tmp, path)
+
+
+pdf_cache = PdfCache()
+
+
+def iter_pages(path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Yield each page's text in order; pages are only parsed when reached."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    for i, page in enumerate(reader.pages):
+        if max_pages is not None and i >= max_pages:
+            break
+        try:
+            yield page.extract_text() or ""
+        except Exception as e:
+            print(f"Could not extract page {i + 1} of {path}: {e}")
+            yield ""
+
+
+def chunk_sections(pages: List[str]) -> List[Dict[str, Any]]:
+    """Split page texts into sections at heading-like lines. Text before the first heading is 'Front matter'."""
+    sections = [{"title": "Front matter", "page": 1, "lines": []}]
+    for page_no, text in enumerate(pages, 1):
+        for line in text.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if len(stripped) <= 80 and _HEADING_RE.match(stripped):
+                sections.append({"title": stripped, "page": page_no, "lines": []})
+            else:
+                sections[-1]["lines"].append(stripped)
+    out = []
+    for s in sections:
+        text = re.sub(r"-\n(?=[a-z])", "", "\n".join(s["lines"]))  # re-join hyphenated line breaks
+        text = re.sub(r"\s*\n\s*", " ", text).strip()
+        if text:
+            out.append({"title": s["title"], "page": s["page"], "text": text})
+    return out
+
+
+def extract(sha256: str, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    """Extract (or load cached) text for a downloaded PDF."""
+    doc = pdf_cache.load_text(sha256, max_pages)
+    if doc is not None:
+        return doc
+    pages = list(iter_pages(pdf_cache.blob_path(sha256), max_pages))
+    doc = {"sha256": sha256, "pages": len(pages), "max_pages": max_pages, "sections": chunk_sections(pages)}
+    pdf_cache.save_text(sha256, doc, max_pages)
+    return doc
+
+
+def load_fulltext(pdf_url: str, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    """Download (once) and extract (once) a paper's PDF. Returns {sha256, pages, sections: [{title, page, text}]}."""
+    return extract(pdf_cache.download(pdf_url), max_pages)
+
+
+def _doc_to_text(doc: Dict[str, Any]) -> str:
+    # A JSON header line, then one "page<TAB>title<TAB>text" line per section
+    # (chunk_sections collapses newlines, so section text never contains one)
+    header = json.dumps({k: v for k, v in doc.items() if k != "sections"})
+    lines = [header] + [f"{s['page']}\t{' '.join(s['title'].split())}\t{s['text']}" for s in doc["sections"]]
+    return "\n".join(lines)
+
+
+def _doc_from_text(text: str) -> Dict[str, Any]:
+    header, *lines = text.split("\n")
+    sections = []
+    for line in lines:
+        page, title, body = line.split("\t", 2)
+        sections.append({"title": title, "page": int(page), "text": body})
+    return {**json.loads(header), "sections": sections}
+
+
+class QueueFull(Exception):
+    """Raised when the extraction queue is at capacity."""
+
+
+class _Alarm(BaseException):
+    # BaseException so the per-page `except Exception` in iter_pages cannot swallow it
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _Alarm()
+
+
+def _init_worker(max_mb: int) -> None:
+    if resource is not None and max_mb > 0:
+        limit = max_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _extract_worker(path: str, max_pages: Optional[int], timeout: float) -> Dict[str, Any]:
+    """Runs in a pool process: parse at most `max_pages` pages within `timeout` seconds."""
+    alarm = timeout > 0 and hasattr(signal, "SIGALRM")
+    if alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        pages = list(iter_pages(path, max_pages))
+    except _Alarm:
+        raise TimeoutError(f"extraction took longer than {timeout:g}s") from None
+    except MemoryError:
+        raise MemoryError("extraction exceeded the worker memory limit") from None
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return {"pages": len(pages), "sections": chunk_sections(pages)}
+
+
+class ExtractionPool:
+    """Background PDF text extraction on a process pool.
+
+    Jobs are keyed by PDF URL, so asking for the same paper again returns the
+    running job. Downloads run on a small thread pool, parsing on worker processes.
+    """
+
+    def __init__(
+        self,
+        workers: int = PDF_WORKERS,
+        max_queue: int = PDF_QUEUE_SIZE,
+        timeout: float = PDF_JOB_TIMEOUT,
+        max_pages: Optional[int] = PDF_MAX_PAGES,
+        max_mb: int = PDF_WORKER_MAX_MB,
+        max_tasks: int = PDF_WORKER_MAX_TASKS,
+        cache: PdfCache = pdf_cache,
+        corpus: Corpus = corpus,
+    ):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_pages = max_pages or None
+        self.max_mb = max_mb
+        self.max_tasks = max_tasks
+        self.cache = cache
+        self.corpus = corpus
+        self._procs: Optional[ProcessPoolExecutor] = None
+        self._downloads = ThreadPoolExecutor(max_workers=min(16, 2 * self.workers), thread_name_prefix="pdf")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._cond = threading.Condition()
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._restarts = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Started on first use so importing this module never forks
+        with self._cond:
+            if self._procs is None:
+                self._procs = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    max_tasks_per_child=self.max_tasks or None,
+                    initializer=_init_worker,
+                    initargs=(self.max_mb,),
+                )
+            return self._procs
+
+    def _reset_executor(self, broken: ProcessPoolExecutor) -> None:
+        """Drop a pool with a dead or hung worker; _executor() starts a fresh one for the next job."""
+        with self._cond:
+            if self._procs is not broken:
+                return  # another job already replaced it
+            self._procs = None
+            self._restarts += 1
+        # A hung worker never returns its slot, so stop the processes rather than wait for them
+        for proc in list((getattr(broken, "_processes", None) or {}).values()):
+            proc.terminate()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _extract(self, sha: str) -> Dict[str, Any]:
+        """Parse a downloaded PDF on the process pool, replacing the pool if it breaks."""
+        retried = False
+        while True:
+            executor = self._executor()
+            try:
+                future = executor.submit(_extract_worker, self.cache.blob_path(sha), self.max_pages, self.timeout)
+                # The worker enforces the limit itself; this only catches a worker that cannot be interrupted
+                return future.result(timeout=self.timeout + 10 if self.timeout > 0 else None)
+            except FutureTimeout:
+                if future.done():
+                    raise  # the worker's own limit
+                self._reset_executor(executor)
+                raise TimeoutError(f"extraction took longer than {self.timeout:g}s") from None
+            except (BrokenProcessPool, CancelledError):
+                # A worker died (memory limit, crash, kill) and took the pool down; other jobs on it
+                # land here too, so try once more on the new pool
+                self._reset_executor(executor)
+                if retried:
+                    raise
+                retried = True
+
+    def cached(self, url: str) -> Optional[Dict[str, Any]]:
+        """Extracted text if this URL was already downloaded and parsed, without queueing anything."""
+        url = _pdf_url(url)
+        text = self.corpus.get(url, FULLTEXT)
+        if text is not None:
+            return _doc_from_text(text)
+        # Extracted before the corpus existed: copy it over so the next read skips the gunzip
+        sha = self.cache.lookup(url)
+        doc = self.cache.load_text(sha, self.max_pages) if sha else None
+        if doc is not None:
+            self.corpus.put(url, _doc_to_text(doc), FULLTEXT)
+        return doc
+
+    def status(self, url: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(_pdf_url(url))
+        return {k: v for k, v in job.items() if k != "event"} if job else None
+
+    def submit(self, url: str, block: bool = False) -> Dict[str, Any]:
+        """Queue extraction of a PDF (no-op if already queued, running or done).
+
+        Raises QueueFull when the queue is at capacity, unless `block` is set.
+        """
+        url = _pdf_url(url)
+        with self._cond:
+            while True:
+                job = self._jobs.get(url)
+                if job and job["status"] != "failed":
+                    return self.status(url)
+                if self._active < self.max_queue:
+                    break
+                if not block:
+                    raise QueueFull(f"{self._active} extraction jobs pending")
+                self._cond.wait()
+            if len(self._jobs) >= 4 * self.max_queue:
+                self.forget(0)  # finished jobs are on disk; status falls back to the text cache
+            self._active += 1
+            self._jobs[url] = {"url": url, "status": "queued", "submitted": time.time(), "event": threading.Event()}
+            # Taken before the job starts: a fast job may finish and be forgotten before we return
+            queued = self.status(url)
+        self._downloads.submit(self._run, url)
+        return queued
+
+    def _run(self, url: str) -> None:
+        job = self._jobs[url]
+        try:
+            job["status"] = "downloading"
+            sha = job["sha256"] = self.cache.download(url)
+            doc = self.cache.load_text(sha, self.max_pages)
+            if doc is None:
+                job["status"] = "extracting"
+                job["started"] = time.time()
+                doc = {"sha256": sha, "max_pages": self.max_pages, **self._extract(sha)}
+                self.cache.save_text(sha, doc, self.max_pages)
+            self.corpus.put(url, _doc_to_text(doc), FULLTEXT)
+            job["pages"] = doc["pages"]
+            job["status"] = "done"
+            self._completed += 1
+        except Exception as e:
+            print(f"PDF extraction failed for {url}: {e}")
+            job["status"] = "failed"
+            job["error"] = f"{type(e).__name__}: {e}"
+            self._failed += 1
+        finally:
+            job["finished"] = time.time()
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+            job["event"].set()
+
+    def wait(self, url: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until a submitted job finishes; returns its status (None if unknown or already forgotten)."""
+        job = self._jobs.get(_pdf_url(url))
+        if job is None:
+            return None
+        job["event"].wait(timeout)
+        return self.status(url)
+
+    def fulltext(self, url: str, timeout: Optional[float] = None, block: bool = True) -> Dict[str, Any]:
+        """Extracted text for a PDF, queueing and waiting for the job if needed.
+
+        Raises TimeoutError if the job is not done within `timeout`, and QueueFull
+        when the queue is at capacity and `block` is not set.
+        """
+        doc = self.cached(url)
+        if doc is not None:
+            return doc
+        self.submit(url, block=block)
+        job = self.wait(url, timeout)
+        if job is None:
+            # Finished and forgotten before we looked: a done job left its text in the cache
+            doc = self.cached(url)
+            if doc is not None:
+                return doc
+            raise TimeoutError(f"full text of {url} not ready")
+        if job["status"] == "failed":
+            raise ValueError(job["error"])
+        if job["status"] != "done":
+            raise TimeoutError(f"full text of {url} not ready after {timeout}s")
+        return self.cached(url)
+
+    def extract_many(self, urls: List[str], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Extract a batch (e.g. a whole reading list) across all workers. Returns a status per URL."""
+        for url in urls:
+            self.submit(url, block=True)
+        deadline = time.time() + timeout if timeout else None
+        return [self.wait(url, max(0.0, deadline - time.time()) if deadline else None) for url in urls]
+
+    def forget(self, older_than: float = 3600.0) -> int:
+        """Drop finished job records older than `older_than` seconds; their text stays cached on disk."""
+        cutoff = time.time() - older_than
+        with self._cond:
+            stale = [u for u, j in self._jobs.items() if j.get("finished") and j["finished"] < cutoff]
+            for u in stale:
+                del self._jobs[u]
+        return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            by_status: Dict[str, int] = {}
+            for job in self._jobs.values():
+                by_status[job["status"]] = by_status.get(job["status"], 0) + 1
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "pending": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "restarts": self._restarts,
+                "jobs": by_status,
+            }
+
+    def shutdown(self) -> None:
+        self._downloads.shutdown(wait=False, cancel_futures=True)
+        if self._procs is not None:
+            self._procs.shutdown(wait=False, cancel_futures=True)
+
+
+extraction_pool = ExtractionPool()
+
+
+def body_sections(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Sections up to the references/acknowledgements."""
+    out = []
+    for s in doc.get("sections", []):
+        if s["title"].strip().lower().lstrip("0123456789. ") in _TRAILING_SECTIONS:
+            break
+        out.append(s)
+    return out
+
+
+def fulltext_context(doc: Dict[str, Any], question: str = "", max_chars: Optional[int] = PDF_CONTEXT_CHARS) -> str:
+    """Paper body as chat context. With a budget, keeps the sections sharing the most terms with the question."""
+    sections = body_sections(doc)
+    if max_chars is None or sum(len(s["text"]) for s in sections) <= max_chars:
+        return "\n\n".join(f"{s['title']}\n{s['text']}" for s in sections)
+    q = set(_tokenize(question))
+    ranked = sorted(
+        range(len(sections)),
+        key=lambda i: (len(q.intersection(_tokenize(sections[i]["text"]))) / (1 + len(sections[i]["text"]) / 2000), -i),
+        reverse=True,
+    )
+    keep, used = set(), 0
+    for i in ranked:
+        size = len(sections[i]["text"])
+        if used + size > max_chars:
+            continue
+        keep.add(i)
+        used += size
+    if not keep:
+        return sections[ranked[0]]["text"][:max_chars]
+    # Present the chosen sections in document order
+    return "\n\n".join(f"{sections[i]['title']}\n{sections[i]['text']}" for i in sorted(keep))
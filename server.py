@@ -1,69 +1,579 @@
-from fastapi import FastAPI, Query, HTTPException
-from fastapi.responses import JSONResponse
-from fastapi import Body
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
-from arxiv_tool import arxiv_search
-from ai_services import ai_summarize, ai_chat
-
-app = FastAPI(title="AI Researcher Agent", version="0.1.0")
-
-
-@app.get("/health")
-def health():
-    return {"status": "ok"}
-
-
-@app.get("/search")
-def search(topic: str = Query(..., min_length=1), max_results: int = Query(5, ge=1, le=50)):
-    try:
-        result = arxiv_search.invoke(topic)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-    entries = result.get("entries", [])
-    if len(entries) > max_results:
-        entries = entries[:max_results]
-    return JSONResponse(content={"entries": entries})
-
-
-class SummarizeRequest(BaseModel):
-    text: str
-    mode: Optional[str] = "default"  # "default" | "eli5"
-    provider: Optional[str] = "offline"  # offline | openai | groq | anthropic | gemini
-
-
-@app.post("/summarize")
-def summarize(req: SummarizeRequest):
-    if not req.text or len(req.text.strip()) == 0:
-        raise HTTPException(status_code=400, detail="Missing 'text' to summarize")
-    try:
-        result = ai_summarize(req.text, mode=req.mode or "default", provider=req.provider or "offline")
-        return JSONResponse(content=result)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-class ChatRequest(BaseModel):
-    context: str
-    question: str
-    mode: Optional[str] = "default"
-    provider: Optional[str] = "offline"
-    history: Optional[List[Dict[str, str]]] = None  # [{role, content}]
-
-
-@app.post("/chat")
-def chat(req: ChatRequest):
-    if not req.context or not req.question:
-        raise HTTPException(status_code=400, detail="Missing 'context' or 'question'")
-    try:
-        answer = ai_chat(
-            context=req.context,
-            question=req.question,
-            mode=req.mode or "default",
-            provider=req.provider or "offline",
-            history=req.history or [],
-        )
-        return JSONResponse(content={"answer": answer})
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+from fastapi import Depends, FastAPI, Header, Query, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import Body
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Any, Tuple
+import json
+import re
+from datetime import date
+from arxiv_tool import ArxivQuery, arxiv_limiter, async_search_arxiv_papers, close_async_client, iter_arxiv_pages, local_index, search_cache
+from rate_limit import PRIORITY_NAMES
+from alerts_worker import alert_store
+from store import store
+from corpus import corpus
+from identity import dedupe, paper_key, parse_arxiv_id
+from export import FORMATS as EXPORT_FORMATS, export, export_filename
+from read_pdf import PDF_CHAT_WAIT, PDF_CONTEXT_CHARS, QueueFull, extraction_pool, fulltext_context
+from ai_services import (
+    ai_chat,
+    ai_chat_stream,
+    ai_summarize_stream,
+    batch_summarize,
+    cached_summarize,
+    llm_latency,
+    provider_registry,
+    summary_cache,
+)
+
+app = FastAPI(title="AI Researcher Agent", version="0.1.0")
+
+
+@app.on_event("startup")
+def startup():
+    # Pay SDK import / client setup once at boot instead of on the first request
+    ready = provider_registry.warm_up()
+    if ready:
+        print(f"LLM providers warmed up: {ready}")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_async_client()
+    extraction_pool.shutdown()
+
+
+# The caller's identity comes from the X-User-Id header
+# (set by an auth proxy or the Streamlit frontend).
+_USER_ID_RE = re.compile(r"^[A-Za-z0-9_.@+-]{1,128}$")
+
+
+def current_user(x_user_id: Optional[str] = Header(None)) -> str:
+    if not x_user_id:
+        raise HTTPException(status_code=401, detail="Missing X-User-Id header")
+    if not _USER_ID_RE.match(x_user_id):
+        raise HTTPException(status_code=400, detail="Invalid X-User-Id header")
+    return x_user_id
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "search_cache": search_cache.stats(),
+        "summary_cache": summary_cache.stats(),
+        "arxiv_rate_limit": arxiv_limiter.stats(),
+        "llm_latency": llm_latency.snapshot(),
+        "pdf_extraction": extraction_pool.stats(),
+        "corpus": corpus.stats(),
+    }
+
+
+def arxiv_query_params(
+    topic: str = Query(""),
+    title: str = Query(""),
+    author: str = Query(""),
+    abstract: str = Query(""),
+    cat: List[str] = Query([]),
+    submitted_from: Optional[date] = Query(None),
+    submitted_to: Optional[date] = Query(None),
+) -> ArxivQuery:
+    # Filters are pushed into the arXiv query so only matching papers are downloaded
+    return ArxivQuery(
+        terms=topic,
+        title=title,
+        author=author,
+        abstract=abstract,
+        categories=tuple(c for c in cat if c),
+        submitted_from=submitted_from,
+        submitted_to=submitted_to,
+    )
+
+
+@app.get("/search")
+async def search(
+    query: ArxivQuery = Depends(arxiv_query_params),
+    max_results: int = Query(5, ge=1, le=50),
+    priority: str = Query("interactive", pattern="^(interactive|background)$"),
+):
+    try:
+        result = await async_search_arxiv_papers("", max_results=max_results, priority=PRIORITY_NAMES[priority], query=query)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Copies, so near-duplicate flags don't leak into the cached response
+    entries = dedupe(dict(e) for e in result.get("entries", [])[:max_results])
+    return JSONResponse(content={"entries": entries})
+
+
+@app.get("/search/stream")
+def search_stream(
+    query: ArxivQuery = Depends(arxiv_query_params),
+    max_results: int = Query(100, ge=1, le=2000),
+    page_size: int = Query(50, ge=1, le=500),
+    priority: str = Query("interactive", pattern="^(interactive|background)$"),
+):
+    # Validate the query up front so bad input is a 400, not a broken stream
+    pages = iter_arxiv_pages("", max_results=max_results, page_size=page_size, priority=PRIORITY_NAMES[priority], query=query)
+    try:
+        first = next(pages, [])
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def ndjson():
+        page = first
+        while page:
+            for entry in page:
+                yield json.dumps(entry) + "\n"
+            try:
+                page = next(pages, [])
+            except Exception as e:
+                yield json.dumps({"error": str(e)}) + "\n"
+                return
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+_EXPORT_FORMAT = Query("jsonl", alias="format", pattern="^(" + "|".join(EXPORT_FORMATS) + ")$")
+
+
+def _export_response(papers, fmt: str, stem: str) -> StreamingResponse:
+    # Serialized one paper at a time as the client reads, never held as a whole
+    return StreamingResponse(
+        export(papers, fmt),
+        media_type=f"{EXPORT_FORMATS[fmt][1]}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(stem, fmt)}"'},
+    )
+
+
+@app.get("/export")
+def export_search(
+    fmt: str = _EXPORT_FORMAT,
+    query: ArxivQuery = Depends(arxiv_query_params),
+    max_results: int = Query(100, ge=1, le=10000),
+    page_size: int = Query(100, ge=1, le=500),
+    priority: str = Query("interactive", pattern="^(interactive|background)$"),
+):
+    """Search results in any export format, fetched page by page while the file downloads."""
+    pages = iter_arxiv_pages("", max_results=max_results, page_size=page_size, priority=PRIORITY_NAMES[priority], query=query)
+    try:
+        first = next(pages, [])
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def papers():
+        yield from first
+        try:
+            for page in pages:
+                yield from page
+        except Exception as e:
+            # Headers are already sent; end the file at the last complete page
+            print(f"Export stopped early: {e}")
+
+    return _export_response(papers(), fmt, f"papers_{query.terms or query.title or query.author or 'arxiv'}")
+
+
+@app.get("/local_search")
+def local_search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    title_boost: float = Query(2.0, ge=0.0),
+    summary_boost: float = Query(1.0, ge=0.0),
+):
+    entries = local_index.search(q, limit=limit, boosts={"title": title_boost, "summary": summary_boost})
+    return JSONResponse(content={"entries": entries, "indexed": len(local_index)})
+
+
+@app.delete("/local_search")
+def local_search_delete(doc_id: str = Query(..., min_length=1)):
+    if not local_index.delete(doc_id):
+        raise HTTPException(status_code=404, detail=f"Not indexed: {doc_id}")
+    return {"deleted": doc_id}
+
+
+class WatchRequest(BaseModel):
+    kind: str = "topic"  # topic | author
+    query: str
+
+
+@app.post("/alerts/watch")
+def alerts_watch(req: WatchRequest, user_id: str = Depends(current_user)):
+    # Same as POST /me/topics or /me/authors: every watch belongs to a user, so it can be dropped again
+    if not req.query or len(req.query.strip()) == 0:
+        raise HTTPException(status_code=400, detail="Missing 'query' to watch")
+    if req.kind not in ("topic", "author"):
+        raise HTTPException(status_code=400, detail=f"Unknown alert kind: {req.kind}")
+    add = store.add_topic if req.kind == "topic" else store.add_author
+    added = add(req.query, user_id)
+    alert_store.watch(req.kind, req.query)
+    return {"kind": req.kind, "query": req.query.strip(), "added": added}
+
+
+@app.get("/alerts/new")
+def alerts_new(
+    since: float = Query(0.0, ge=0.0),
+    limit: int = Query(50, ge=1, le=500),
+    user_id: str = Depends(current_user),
+):
+    # Precomputed by alerts_worker.py; never calls arXiv. Only the caller's own topics and authors.
+    mine = [("topic", t) for t in store.topics(user_id)] + [("author", a) for a in store.authors(user_id)]
+    return JSONResponse(content={
+        "entries": alert_store.new_since(since=since, limit=limit, only=mine),
+        "watches": alert_store.watches(only=mine),
+        "last_checked": alert_store.last_checked(only=mine),
+    })
+
+
+def _paper_text(doc_id: str, categories: bool = False) -> Optional[str]:
+    """Title/authors/abstract of an already-fetched paper, from the local index and the corpus."""
+    entry = local_index.get(doc_id)  # any version, id or abs/pdf link
+    if entry is None:
+        abstract = corpus.get(doc_id)
+        return f"Abstract: {abstract}" if abstract else None
+    text = f"Title: {entry.get('title', '')}\nAuthors: {', '.join(entry.get('authors', []))}\nAbstract: {entry.get('summary', '')}"
+    if categories:
+        text += f"\nCategories: {', '.join(entry.get('categories', []))}"
+    return text
+
+
+class SummarizeRequest(BaseModel):
+    text: Optional[str] = None
+    id: Optional[str] = None  # arXiv id/link of a fetched paper, instead of sending its text
+    mode: Optional[str] = "default"  # "default" | "eli5"
+    provider: Optional[str] = "offline"  # offline | openai | groq | anthropic | gemini
+
+
+def _summarize_text(req: SummarizeRequest) -> str:
+    if req.text and req.text.strip():
+        return req.text
+    if req.id:
+        text = _paper_text(req.id)
+        if text is None:
+            raise HTTPException(status_code=404, detail=f"Unknown paper: {req.id}")
+        return text
+    raise HTTPException(status_code=400, detail="Missing 'text' to summarize")
+
+
+@app.post("/summarize")
+def summarize(req: SummarizeRequest):
+    text = _summarize_text(req)
+    try:
+        result, status = cached_summarize(text, mode=req.mode or "default", provider=req.provider or "offline")
+        return JSONResponse(content=result, headers={"X-Cache": status})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse(events):
+    # Server-Sent Events: one JSON payload per "data:" frame
+    for event in events:
+        yield f"data: {json.dumps(event)}\n\n"
+
+
+def _sse_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        _sse(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/summarize/stream")
+def summarize_stream(req: SummarizeRequest):
+    text = _summarize_text(req)
+
+    def events():
+        try:
+            yield from ai_summarize_stream(text, mode=req.mode or "default", provider=req.provider or "offline")
+        except Exception as e:
+            yield {"error": str(e)}
+
+    return _sse_response(events())
+
+
+class BatchSummarizeRequest(BaseModel):
+    texts: Optional[List[str]] = None
+    ids: Optional[List[str]] = None  # abstracts read from the corpus instead
+    mode: Optional[str] = "default"  # "default" | "eli5"
+    max_sentences: Optional[int] = 5
+
+
+@app.post("/summarize/batch")
+def summarize_batch(req: BatchSummarizeRequest):
+    # Offline extractive engine only; meant for bulk/nightly digests
+    texts = req.texts
+    positions = None
+    if not texts and req.ids:
+        # Each paper is summarized once, however many of its versions or links were sent
+        ids: Dict[str, str] = {}
+        for doc_id in req.ids:
+            ids.setdefault(paper_key({"id": doc_id}) or doc_id, doc_id)
+        slot = {key: i for i, key in enumerate(ids)}
+        positions = [slot[paper_key({"id": doc_id}) or doc_id] for doc_id in req.ids]
+        texts = [(local_index.get(doc_id) or {}).get("summary") or corpus.get(doc_id) for doc_id in ids.values()]
+        missing = [doc_id for doc_id, text in zip(ids.values(), texts) if text is None]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Unknown papers: {', '.join(missing[:20])}")
+    if not texts:
+        raise HTTPException(status_code=400, detail="Missing 'texts' to summarize")
+    try:
+        results = batch_summarize(texts, max_sentences=req.max_sentences or 5, eli5=(req.mode or "").lower() == "eli5")
+        if positions is not None:
+            results = [results[i] for i in positions]
+        return JSONResponse(content={"results": results})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class ChatRequest(BaseModel):
+    context: Optional[str] = None
+    id: Optional[str] = None  # arXiv id/link of a fetched paper, instead of sending its context
+    question: str
+    mode: Optional[str] = "default"
+    provider: Optional[str] = "offline"
+    history: Optional[List[Dict[str, str]]] = None  # [{role, content}]
+    pdf: Optional[str] = None  # arXiv id or abs/pdf link: answer from the full text, not just the abstract
+
+
+def _chat_context(req: ChatRequest) -> Tuple[str, bool]:
+    """The context to answer from, and whether the requested full text is still being extracted."""
+    if not req.question:
+        raise HTTPException(status_code=400, detail="Missing 'context' or 'question'")
+    context = req.context
+    if not context and req.id:
+        context = _paper_text(req.id, categories=True)
+        if context is None:
+            raise HTTPException(status_code=404, detail=f"Unknown paper: {req.id}")
+    if not context:
+        raise HTTPException(status_code=400, detail="Missing 'context' or 'question'")
+    if not req.pdf:
+        return context, False
+    # Only arXiv PDFs: the server fetches this URL, so never let a client pick the host
+    url = _arxiv_pdf_url(req.pdf)
+    if not url:
+        raise HTTPException(status_code=400, detail=f"'pdf' must be an arXiv id or arxiv.org link: {req.pdf}")
+    try:
+        # Never hold a request thread on a full queue or a slow PDF: answer from the abstract
+        # and let the job finish in the background for the next question
+        doc = extraction_pool.fulltext(url, timeout=PDF_CHAT_WAIT, block=False)
+    except (QueueFull, TimeoutError) as e:
+        print(f"Full text pending for {url}: {e}")
+        return context, True
+    except Exception as e:
+        print(f"Full text unavailable for {url}: {e}")
+        return context, False
+    # Offline retrieval indexes every sentence; LLMs get the sections most related to the question
+    budget = None if (req.provider or "offline").lower() == "offline" else PDF_CONTEXT_CHARS
+    return f"{context}\n\nFull text:\n{fulltext_context(doc, req.question, budget)}", False
+
+
+@app.post("/chat")
+def chat(req: ChatRequest):
+    context, pending = _chat_context(req)
+    try:
+        answer = ai_chat(
+            context=context,
+            question=req.question,
+            mode=req.mode or "default",
+            provider=req.provider or "offline",
+            history=req.history or [],
+        )
+        content = {"answer": answer}
+        if pending:
+            content["fulltext_pending"] = True
+        return JSONResponse(content=content)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/chat/stream")
+def chat_stream(req: ChatRequest):
+    context, pending = _chat_context(req)
+
+    def events():
+        parts = []
+        try:
+            for delta in ai_chat_stream(
+                context=context,
+                question=req.question,
+                mode=req.mode or "default",
+                provider=req.provider or "offline",
+                history=req.history or [],
+            ):
+                parts.append(delta)
+                yield {"delta": delta}
+        except Exception as e:
+            yield {"error": str(e)}
+            return
+        done = {"done": True, "answer": "".join(parts)}
+        if pending:
+            done["fulltext_pending"] = True
+        yield done
+
+    return _sse_response(events())
+
+
+# Full text. Extraction runs on the read_pdf process pool; these endpoints
+# only queue jobs and report on them.
+def _arxiv_pdf_url(paper_id: str) -> Optional[str]:
+    base, version = parse_arxiv_id(paper_id)
+    # Same form as the `pdf` links in search results, so both share one cache entry
+    if base is None:
+        return None
+    return f"http://arxiv.org/pdf/{base}v{version}" if version else f"http://arxiv.org/pdf/{base}"
+
+
+def _submit_fulltext(url: str) -> Dict[str, Any]:
+    try:
+        return extraction_pool.submit(url)
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+
+class FulltextBatchRequest(BaseModel):
+    ids: List[str]  # arXiv ids or abs/pdf links
+
+
+@app.get("/papers/{paper_id:path}/fulltext")
+def paper_fulltext(paper_id: str, wait: float = Query(0.0, ge=0, le=60), retry: bool = Query(False)):
+    """Cached sections (200), or the extraction job's status (202) after queueing it."""
+    url = _arxiv_pdf_url(paper_id)
+    if not url:
+        raise HTTPException(status_code=400, detail=f"Not an arXiv id: {paper_id}")
+    doc = extraction_pool.cached(url)
+    if doc is None:
+        job = extraction_pool.status(url)
+        if job is None or (retry and job["status"] == "failed"):
+            job = _submit_fulltext(url)
+        if wait and job["status"] not in ("done", "failed"):
+            job = extraction_pool.wait(url, wait)
+        if job is not None and job["status"] == "failed":
+            raise HTTPException(status_code=422, detail=job["error"])
+        doc = extraction_pool.cached(url)
+        if doc is None:
+            if job is None:
+                # Forgotten between submit and wait without leaving text behind: queue it again
+                job = _submit_fulltext(url)
+            return JSONResponse(status_code=202, content={"id": paper_id, **job})
+    return {"id": paper_id, "status": "done", **doc}
+
+
+@app.post("/papers/fulltext")
+def papers_fulltext(req: FulltextBatchRequest):
+    """Queue extraction for many papers at once (e.g. a reading list). Never blocks."""
+    jobs = []
+    for paper_id in req.ids:
+        url = _arxiv_pdf_url(paper_id)
+        if not url:
+            jobs.append({"id": paper_id, "status": "invalid"})
+            continue
+        try:
+            jobs.append({"id": paper_id, **extraction_pool.submit(url)})
+        except QueueFull:
+            jobs.append({"id": paper_id, "status": "rejected"})
+    return {"jobs": jobs, "pool": extraction_pool.stats()}
+
+
+# Per-user storage, keyed by current_user.
+class ValueRequest(BaseModel):
+    value: str
+
+
+class ChatMessageRequest(BaseModel):
+    doc_key: str
+    role: str
+    content: str
+
+
+def _unwatch_if_unused(kind: str, query: str) -> None:
+    # The worker polls every watch; stop once the last user holding this one has dropped it
+    if not store.is_watched(kind, query):
+        alert_store.unwatch(kind, query.strip())
+
+
+@app.get("/me")
+def me(user_id: str = Depends(current_user)):
+    return {"user_id": user_id, **store.load(user_id)}
+
+
+@app.post("/me/topics")
+def me_add_topic(req: ValueRequest, user_id: str = Depends(current_user)):
+    if not req.value.strip():
+        raise HTTPException(status_code=400, detail="Missing 'value'")
+    added = store.add_topic(req.value, user_id)
+    alert_store.watch("topic", req.value)
+    return {"topic": req.value.strip(), "added": added}
+
+
+@app.delete("/me/topics")
+def me_remove_topic(value: str = Query(..., min_length=1), user_id: str = Depends(current_user)):
+    if not store.remove_topic(value, user_id):
+        raise HTTPException(status_code=404, detail=f"Not watching topic: {value}")
+    _unwatch_if_unused("topic", value)
+    return {"deleted": value}
+
+
+@app.post("/me/authors")
+def me_add_author(req: ValueRequest, user_id: str = Depends(current_user)):
+    if not req.value.strip():
+        raise HTTPException(status_code=400, detail="Missing 'value'")
+    added = store.add_author(req.value, user_id)
+    alert_store.watch("author", req.value)
+    return {"author": req.value.strip(), "added": added}
+
+
+@app.delete("/me/authors")
+def me_remove_author(value: str = Query(..., min_length=1), user_id: str = Depends(current_user)):
+    if not store.remove_author(value, user_id):
+        raise HTTPException(status_code=404, detail=f"Not following author: {value}")
+    _unwatch_if_unused("author", value)
+    return {"deleted": value}
+
+
+@app.get("/me/reading_list")
+def me_reading_list(user_id: str = Depends(current_user)):
+    return {"entries": store.reading_list(user_id)}
+
+
+@app.get("/me/reading_list/export")
+def me_reading_list_export(fmt: str = _EXPORT_FORMAT, user_id: str = Depends(current_user)):
+    return _export_response(store.iter_reading_list(user_id), fmt, "reading_list")
+
+
+@app.post("/me/reading_list")
+def me_save_paper(entry: Dict[str, Any] = Body(...), user_id: str = Depends(current_user)):
+    if not (entry.get("id") or entry.get("pdf") or entry.get("title")):
+        raise HTTPException(status_code=400, detail="Entry needs an 'id', 'pdf' or 'title'")
+    return {"added": store.save_paper(entry, user_id)}
+
+
+@app.delete("/me/reading_list")
+def me_remove_paper(doc_key: str = Query(..., min_length=1), user_id: str = Depends(current_user)):
+    if not store.remove_paper(doc_key, user_id):
+        raise HTTPException(status_code=404, detail=f"Not in reading list: {doc_key}")
+    return {"deleted": doc_key}
+
+
+@app.get("/me/chats")
+def me_chat_history(
+    doc_key: str = Query(..., min_length=1),
+    limit: int = Query(200, ge=1, le=1000),
+    user_id: str = Depends(current_user),
+):
+    return {"doc_key": doc_key, "history": store.chat_history(doc_key, user_id, limit)}
+
+
+@app.post("/me/chats")
+def me_append_chat(req: ChatMessageRequest, user_id: str = Depends(current_user)):
+    if req.role not in ("user", "assistant"):
+        raise HTTPException(status_code=400, detail="'role' must be 'user' or 'assistant'")
+    store.append_chat(req.doc_key, req.role, req.content, user_id)
+    return {"ok": True}
+
+
+@app.delete("/me/chats")
+def me_clear_chat(doc_key: str = Query(..., min_length=1), user_id: str = Depends(current_user)):
+    return {"deleted": store.clear_chat(doc_key, user_id)}
@@ -0,0 +1,296 @@
+"""
+Transactional per-user store for alert topics, followed authors, reading
+lists and chat histories.
+
+Replaces the single alerts_store.json that was rewritten in full on every
+click. Rows live in SQLite (WAL mode) and every write is a single-row insert
+or delete owned by a user id. Users are spread over several shard files so
+concurrent users rarely contend for the same write lock.
+
+    python store.py --import alerts_store.json   # one-shot migration
+"""
+import argparse
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_USER = "local"
+
+
+def _doc_key(entry: Dict[str, Any]) -> Optional[str]:
+    return entry.get("id") or entry.get("pdf") or entry.get("title")
+
+
+class Store:
+    def __init__(self, path: str = "research_store.db"):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # A shard file only appears once one of its users is read or written
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS users (user_id TEXT PRIMARY KEY, created REAL NOT NULL);
+                CREATE TABLE IF NOT EXISTS topics (
+                    user_id TEXT NOT NULL REFERENCES users (user_id), topic TEXT NOT NULL, created REAL NOT NULL,
+                    PRIMARY KEY (user_id, topic)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS authors (
+                    user_id TEXT NOT NULL REFERENCES users (user_id), author TEXT NOT NULL, created REAL NOT NULL,
+                    PRIMARY KEY (user_id, author)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS reading_list (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL REFERENCES users (user_id), doc_key TEXT NOT NULL,
+                    data TEXT NOT NULL, added REAL NOT NULL,
+                    UNIQUE (user_id, doc_key)
+                );
+                CREATE TABLE IF NOT EXISTS chat_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL REFERENCES users (user_id), doc_key TEXT NOT NULL,
+                    role TEXT NOT NULL, content TEXT NOT NULL, created REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS chat_messages_doc ON chat_messages (user_id, doc_key, id);
+                CREATE INDEX IF NOT EXISTS topics_topic ON topics (topic);
+                CREATE INDEX IF NOT EXISTS authors_author ON authors (author);
+                CREATE TABLE IF NOT EXISTS imports (path TEXT PRIMARY KEY, imported REAL NOT NULL);
+                """
+            )
+            self._local.conn = conn
+        return conn
+
+    def _ensure_user(self, conn: sqlite3.Connection, user_id: str) -> None:
+        conn.execute("INSERT OR IGNORE INTO users (user_id, created) VALUES (?, ?)", (user_id, time.time()))
+
+    def _insert(self, table: str, column: str, value: str, user_id: str) -> bool:
+        value = (value or "").strip()
+        if not value:
+            return False
+        conn = self._conn()
+        with conn:
+            self._ensure_user(conn, user_id)
+            cur = conn.execute(
+                f"INSERT OR IGNORE INTO {table} (user_id, {column}, created) VALUES (?, ?, ?)",
+                (user_id, value, time.time()),
+            )
+        return cur.rowcount == 1
+
+    def _delete(self, table: str, column: str, value: str, user_id: str) -> bool:
+        value = (value or "").strip()
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(f"DELETE FROM {table} WHERE user_id = ? AND {column} = ?", (user_id, value))
+        return cur.rowcount == 1
+
+    def _list(self, table: str, column: str, user_id: str) -> List[str]:
+        rows = self._conn().execute(f"SELECT {column} FROM {table} WHERE user_id = ? ORDER BY created", (user_id,))
+        return [r[0] for r in rows]
+
+    # Topics / authors return True only when the row is new
+    def add_topic(self, topic: str, user_id: str = DEFAULT_USER) -> bool:
+        return self._insert("topics", "topic", topic, user_id)
+
+    def remove_topic(self, topic: str, user_id: str = DEFAULT_USER) -> bool:
+        return self._delete("topics", "topic", topic, user_id)
+
+    def topics(self, user_id: str = DEFAULT_USER) -> List[str]:
+        return self._list("topics", "topic", user_id)
+
+    def add_author(self, author: str, user_id: str = DEFAULT_USER) -> bool:
+        return self._insert("authors", "author", author, user_id)
+
+    def remove_author(self, author: str, user_id: str = DEFAULT_USER) -> bool:
+        return self._delete("authors", "author", author, user_id)
+
+    def authors(self, user_id: str = DEFAULT_USER) -> List[str]:
+        return self._list("authors", "author", user_id)
+
+    def save_paper(self, entry: Dict[str, Any], user_id: str = DEFAULT_USER) -> bool:
+        """Append a paper to the user's reading list. Returns False if it was already saved."""
+        key = _doc_key(entry)
+        if not key:
+            return False
+        conn = self._conn()
+        with conn:
+            self._ensure_user(conn, user_id)
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO reading_list (user_id, doc_key, data, added) VALUES (?, ?, ?, ?)",
+                (user_id, key, json.dumps(entry), time.time()),
+            )
+        return cur.rowcount == 1
+
+    def remove_paper(self, doc_key: str, user_id: str = DEFAULT_USER) -> bool:
+        return self._delete("reading_list", "doc_key", doc_key, user_id)
+
+    def reading_list(self, user_id: str = DEFAULT_USER) -> List[Dict[str, Any]]:
+        rows = self._conn().execute("SELECT data FROM reading_list WHERE user_id = ? ORDER BY id", (user_id,))
+        return [json.loads(r[0]) for r in rows]
+
+    def iter_reading_list(self, user_id: str = DEFAULT_USER, batch: int = 500) -> Iterator[Dict[str, Any]]:
+        """The reading list in saved order, fetched `batch` rows at a time (for exports of any size)."""
+        last = 0
+        while True:
+            # Keyset pages on a fresh query each time: a streaming response may resume on another thread
+            rows = self._conn().execute(
+                "SELECT id, data FROM reading_list WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (user_id, last, batch),
+            ).fetchall()
+            for row_id, data in rows:
+                yield json.loads(data)
+            if len(rows) < batch:
+                return
+            last = rows[-1][0]
+
+    def load(self, user_id: str = DEFAULT_USER) -> Dict[str, List[Any]]:
+        """Everything the Streamlit sidebar shows, in the shape alerts_store.json used to have."""
+        return {
+            "topics": self.topics(user_id),
+            "authors": self.authors(user_id),
+            "reading_list": self.reading_list(user_id),
+        }
+
+    def append_chat(self, doc_key: str, role: str, content: str, user_id: str = DEFAULT_USER) -> None:
+        conn = self._conn()
+        with conn:
+            self._ensure_user(conn, user_id)
+            conn.execute(
+                "INSERT INTO chat_messages (user_id, doc_key, role, content, created) VALUES (?, ?, ?, ?, ?)",
+                (user_id, doc_key, role, content, time.time()),
+            )
+
+    def chat_history(self, doc_key: str, user_id: str = DEFAULT_USER, limit: int = 200) -> List[Dict[str, str]]:
+        """The last `limit` messages about one paper, oldest first."""
+        rows = self._conn().execute(
+            "SELECT role, content FROM chat_messages WHERE user_id = ? AND doc_key = ? ORDER BY id DESC LIMIT ?",
+            (user_id, doc_key, limit),
+        ).fetchall()
+        return [{"role": r, "content": c} for r, c in reversed(rows)]
+
+    def clear_chat(self, doc_key: str, user_id: str = DEFAULT_USER) -> int:
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("DELETE FROM chat_messages WHERE user_id = ? AND doc_key = ?", (user_id, doc_key))
+        return cur.rowcount
+
+    def all_watches(self) -> List[Dict[str, str]]:
+        """Distinct topics and authors across all users, for the alerts worker."""
+        conn = self._conn()
+        out = [{"kind": "topic", "query": r[0]} for r in conn.execute("SELECT DISTINCT topic FROM topics")]
+        out += [{"kind": "author", "query": r[0]} for r in conn.execute("SELECT DISTINCT author FROM authors")]
+        return out
+
+    def is_watched(self, kind: str, query: str) -> bool:
+        """Whether any user in this shard still has the topic or author."""
+        table, column = ("authors", "author") if kind == "author" else ("topics", "topic")
+        row = self._conn().execute(f"SELECT 1 FROM {table} WHERE {column} = ? LIMIT 1", (query.strip(),)).fetchone()
+        return row is not None
+
+    def import_json(self, path: str, user_id: str = DEFAULT_USER) -> int:
+        """One-shot import of a legacy alerts_store.json. Returns rows added (0 if already imported)."""
+        p = pathlib.Path(path)
+        if not p.exists():
+            return 0
+        key = str(p.resolve())
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM imports WHERE path = ?", (key,)).fetchone():
+            return 0
+        data = json.loads(p.read_text(encoding="utf-8"))
+        added = sum(self.add_topic(t, user_id) for t in data.get("topics", []))
+        added += sum(self.add_author(a, user_id) for a in data.get("authors", []))
+        added += sum(self.save_paper(e, user_id) for e in data.get("reading_list", []))
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO imports (path, imported) VALUES (?, ?)", (key, time.time()))
+        return added
+
+
+class ShardedStore:
+    """Routes each user to one of `shards` Store files by a stable hash of the user id."""
+
+    def __init__(self, root: str = "store", shards: int = 8):
+        self.root = root
+        self.shards = [Store(os.path.join(root, f"shard_{i:02d}.db")) for i in range(max(1, int(shards)))]
+
+    def shard(self, user_id: str) -> Store:
+        return self.shards[zlib.crc32(user_id.encode("utf-8")) % len(self.shards)]
+
+    def add_topic(self, topic: str, user_id: str = DEFAULT_USER) -> bool:
+        return self.shard(user_id).add_topic(topic, user_id)
+
+    def remove_topic(self, topic: str, user_id: str = DEFAULT_USER) -> bool:
+        return self.shard(user_id).remove_topic(topic, user_id)
+
+    def topics(self, user_id: str = DEFAULT_USER) -> List[str]:
+        return self.shard(user_id).topics(user_id)
+
+    def add_author(self, author: str, user_id: str = DEFAULT_USER) -> bool:
+        return self.shard(user_id).add_author(author, user_id)
+
+    def remove_author(self, author: str, user_id: str = DEFAULT_USER) -> bool:
+        return self.shard(user_id).remove_author(author, user_id)
+
+    def authors(self, user_id: str = DEFAULT_USER) -> List[str]:
+        return self.shard(user_id).authors(user_id)
+
+    def save_paper(self, entry: Dict[str, Any], user_id: str = DEFAULT_USER) -> bool:
+        return self.shard(user_id).save_paper(entry, user_id)
+
+    def remove_paper(self, doc_key: str, user_id: str = DEFAULT_USER) -> bool:
+        return self.shard(user_id).remove_paper(doc_key, user_id)
+
+    def reading_list(self, user_id: str = DEFAULT_USER) -> List[Dict[str, Any]]:
+        return self.shard(user_id).reading_list(user_id)
+
+    def iter_reading_list(self, user_id: str = DEFAULT_USER, batch: int = 500) -> Iterator[Dict[str, Any]]:
+        return self.shard(user_id).iter_reading_list(user_id, batch)
+
+    def load(self, user_id: str = DEFAULT_USER) -> Dict[str, List[Any]]:
+        return self.shard(user_id).load(user_id)
+
+    def append_chat(self, doc_key: str, role: str, content: str, user_id: str = DEFAULT_USER) -> None:
+        self.shard(user_id).append_chat(doc_key, role, content, user_id)
+
+    def chat_history(self, doc_key: str, user_id: str = DEFAULT_USER, limit: int = 200) -> List[Dict[str, str]]:
+        return self.shard(user_id).chat_history(doc_key, user_id, limit)
+
+    def clear_chat(self, doc_key: str, user_id: str = DEFAULT_USER) -> int:
+        return self.shard(user_id).clear_chat(doc_key, user_id)
+
+    def import_json(self, path: str, user_id: str = DEFAULT_USER) -> int:
+        return self.shard(user_id).import_json(path, user_id)
+
+    def is_watched(self, kind: str, query: str) -> bool:
+        return any(shard.is_watched(kind, query) for shard in self.shards)
+
+    def all_watches(self) -> List[Dict[str, str]]:
+        seen = {}
+        for shard in self.shards:
+            for w in shard.all_watches():
+                seen[(w["kind"], w["query"])] = w
+        return list(seen.values())
+
+
+store = ShardedStore(os.getenv("STORE_DIR", "store"), shards=int(os.getenv("STORE_SHARDS", "8")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Research store maintenance")
+    parser.add_argument("--import", dest="import_path", metavar="JSON", help="import a legacy alerts_store.json")
+    parser.add_argument("--user", default=DEFAULT_USER)
+    args = parser.parse_args()
+    if args.import_path:
+        print(f"Imported {store.import_json(args.import_path, args.user)} rows from {args.import_path}")
+
+
+if __name__ == "__main__":
+    main()
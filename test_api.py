@@ -1,46 +1,396 @@
-"""
-Test script for the AI Researcher Agent API
-"""
-import requests
-import json
-
-BASE_URL = "http://127.0.0.1:8001"
-
-def test_health():
-    """Test the health endpoint"""
-    print("Testing /health endpoint...")
-    response = requests.get(f"{BASE_URL}/health")
-    print(f"Status Code: {response.status_code}")
-    print(f"Response: {response.json()}")
-    print()
-
-def test_search(topic, max_results=3):
-    """Test the search endpoint"""
-    print(f"Testing /search endpoint with topic: '{topic}'...")
-    response = requests.get(
-        f"{BASE_URL}/search",
-        params={"topic": topic, "max_results": max_results}
-    )
-    print(f"Status Code: {response.status_code}")
-    
-    if response.status_code == 200:
-        data = response.json()
-        entries = data.get("entries", [])
-        print(f"Found {len(entries)} papers:")
-        for i, paper in enumerate(entries, 1):
-            print(f"\n{i}. {paper['title']}")
-            print(f"   Authors: {', '.join(paper['authors'][:3])}{'...' if len(paper['authors']) > 3 else ''}")
-            print(f"   Categories: {', '.join(paper['categories'][:3])}")
-            print(f"   PDF: {paper['pdf']}")
-    else:
-        print(f"Error: {response.text}")
-    print()
-
-if __name__ == "__main__":
-    # Test health endpoint
-    test_health()
-    
-    # Test search endpoint with different topics
-    test_search("machine learning", max_results=2)
-    test_search("quantum computing", max_results=2)
-    test_search("neural networks", max_results=2)
+"""
+Test script for the AI Researcher Agent API
+"""
+import requests
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = "http://127.0.0.1:8001"
+
+def test_health():
+    """Test the health endpoint"""
+    print("Testing /health endpoint...")
+    response = requests.get(f"{BASE_URL}/health")
+    print(f"Status Code: {response.status_code}")
+    print(f"Response: {response.json()}")
+    print()
+
+def test_search(topic, max_results=3):
+    """Test the search endpoint"""
+    print(f"Testing /search endpoint with topic: '{topic}'...")
+    response = requests.get(
+        f"{BASE_URL}/search",
+        params={"topic": topic, "max_results": max_results}
+    )
+    print(f"Status Code: {response.status_code}")
+    
+    if response.status_code == 200:
+        data = response.json()
+        entries = data.get("entries", [])
+        print(f"Found {len(entries)} papers:")
+        for i, paper in enumerate(entries, 1):
+            print(f"\n{i}. {paper['title']}")
+            print(f"   Authors: {', '.join(paper['authors'][:3])}{'...' if len(paper['authors']) > 3 else ''}")
+            print(f"   Categories: {', '.join(paper['categories'][:3])}")
+            print(f"   PDF: {paper['pdf']}")
+    else:
+        print(f"Error: {response.text}")
+    print()
+
+def test_concurrent_users(n_users=100, saves_per_user=10):
+    """Load test: n_users save papers concurrently, then each must see exactly their own list"""
+    print(f"Load test: {n_users} concurrent users x {saves_per_user} saves...")
+    run = str(int(time.time()))
+    latencies = []
+
+    def user_session(u):
+        s = requests.Session()
+        s.headers["X-User-Id"] = f"loadtest-{run}-{u}"
+        for i in range(saves_per_user):
+            t0 = time.perf_counter()
+            r = s.post(f"{BASE_URL}/me/reading_list", json={"id": f"{run}-{u}-{i}", "title": f"Paper {i} for user {u}"})
+            latencies.append(time.perf_counter() - t0)
+            r.raise_for_status()
+        return [e["id"] for e in s.get(f"{BASE_URL}/me/reading_list").json()["entries"]]
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_users) as pool:
+        lists = list(pool.map(user_session, range(n_users)))
+    elapsed = time.perf_counter() - t0
+
+    isolated = all(ids == [f"{run}-{u}-{i}" for i in range(saves_per_user)] for u, ids in enumerate(lists))
+    latencies.sort()
+    total = n_users * saves_per_user
+    print(f"Saves: {total} in {elapsed:.2f}s ({total / elapsed:.0f}/s)")
+    print(f"Latency p50: {latencies[len(latencies) // 2] * 1000:.1f} ms, p95: {latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms")
+    print(f"Per-user isolation: {'OK' if isolated else 'FAILED'}")
+    print()
+    return isolated
+
+def _offline_client():
+    """In-process TestClient for checks that need no running server or network"""
+    os.environ.setdefault("SUMMARY_CACHE_PATH", "")
+    from fastapi.testclient import TestClient
+    import server
+    return TestClient(server.app)
+
+def test_race_without_keys():
+    """LLM_STRATEGY=race with no provider keys falls back to the offline answer instead of a 500"""
+    print("Testing race strategy with no API keys...")
+    saved = {k: os.environ.pop(k) for k in ("OPENAI_API_KEY", "GROQ_API_KEY", "ANTHROPIC_API_KEY",
+                                            "GOOGLE_API_KEY", "GOOGLE_GENERATIVE_AI_API_KEY") if k in os.environ}
+    os.environ["LLM_STRATEGY"] = "race"
+    try:
+        from ai_services import llm_generate
+        assert llm_generate("openai", [{"role": "user", "content": "hi"}]) is None
+        client = _offline_client()
+        text = "Transformers changed NLP. Attention lets models weigh tokens. Results improved on many benchmarks."
+        r = client.post("/summarize", json={"text": text, "provider": "openai"})
+        assert r.status_code == 200, r.text
+        assert r.json().get("summary")
+        r = client.post("/chat", json={"context": text, "question": "What changed NLP?", "provider": "groq"})
+        assert r.status_code == 200, r.text
+        assert r.json().get("answer")
+    finally:
+        os.environ.pop("LLM_STRATEGY", None)
+        os.environ.update(saved)
+    print("OK")
+    print()
+
+def test_fallback_summary_cache_key():
+    """A summary written by a fallback provider is cached under that provider, not the requested one"""
+    print("Testing summary cache key under fallback...")
+    import ai_services
+    keys = {"OPENAI_API_KEY": "test", "GROQ_API_KEY": "test"}
+    saved_env = {k: os.environ.get(k) for k in [*keys, "LLM_STRATEGY", "LLM_FALLBACK_CHAIN"]}
+    saved_callers = dict(ai_services._CALLERS)
+    os.environ.update(keys, LLM_STRATEGY="fallback", LLM_FALLBACK_CHAIN="openai,groq")
+    ai_services._CALLERS.update(openai=lambda messages: None, groq=lambda messages: "From groq.\n\n- insight")
+    try:
+        text = f"Fallback cache check {time.time()}. Attention lets models weigh tokens."
+        result, status = ai_services.cached_summarize(text, provider="openai")
+        assert result["summary"] == "From groq." and status == "BYPASS", (result, status)
+        assert ai_services.cached_summarize(text, provider="groq")[1] == "HIT"
+        ai_services._CALLERS["openai"] = lambda messages: "From openai."
+        assert ai_services.cached_summarize(text, provider="openai") == ({"summary": "From openai.", "key_insights": [], "bullets": []}, "MISS")
+    finally:
+        ai_services._CALLERS.update(saved_callers)
+        for k, v in saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+    print("OK")
+    print()
+
+def test_query_encoding():
+    """Free-text terms with URL metacharacters reach arXiv intact, without adding or cutting parameters"""
+    print("Testing search query encoding...")
+    from urllib.parse import parse_qs, urlsplit
+    from arxiv_tool import ArxivQuery, _build_url
+    url = _build_url(ArxivQuery(terms="c++ & rust #1 100% and not go").to_search_query(), 0, 5, "submittedDate", "descending")
+    parts = urlsplit(url)
+    assert parts.fragment == "", url
+    params = parse_qs(parts.query)
+    assert params["search_query"] == ["all:c++ & rust #1 100% AND NOT go"], params
+    assert params["max_results"] == ["5"] and params["sortOrder"] == ["descending"], params
+    assert ArxivQuery(terms="machine learning").to_search_query() == "all:machine+learning"
+    print("OK")
+    print()
+
+def _oai_page(records, token=None):
+    """One OAI-PMH ListRecords response in the arXiv metadata format"""
+    body = "".join(
+        f'<record><header><identifier>oai:arXiv.org:{rid}</identifier></header><metadata>'
+        f'<arXiv xmlns="http://arxiv.org/OAI/arXiv/"><id>{rid}</id><created>2024-01-02</created>'
+        f'<authors><author><keyname>Lovelace</keyname><forenames>Ada</forenames></author></authors>'
+        f'<title>Paper {rid}</title><categories>{cats}</categories><abstract>About {rid}.</abstract></arXiv>'
+        f'</metadata></record>'
+        for rid, cats in records
+    )
+    tail = f'<resumptionToken completeListSize="3">{token}</resumptionToken>' if token else "<resumptionToken/>"
+    return (f'<?xml version="1.0" encoding="UTF-8"?><OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">'
+            f'<ListRecords>{body}{tail}</ListRecords></OAI-PMH>').encode("utf-8")
+
+def test_harvest_offline():
+    """Harvest from a local OAI-PMH stub: 503 + HTTP-date Retry-After, resumption tokens, checkpoint resume"""
+    print("Testing OAI-PMH harvest offline...")
+    import tempfile
+    import threading
+    from datetime import datetime, timedelta, timezone
+    from email.utils import format_datetime
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+    from harvest import _DEFAULT_RETRY_AFTER, Harvester, _retry_after, read_harvest
+
+    soon = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= _retry_after(soon) <= 30 and _retry_after("7") == 7
+    assert _retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert _retry_after("soon") == _retry_after(None) == _DEFAULT_RETRY_AFTER
+
+    pages = {
+        "": _oai_page([("2401.00001", "cs.LG stat.ML"), ("2401.00002", "math.CO")], token="t1"),
+        "t1": _oai_page([("2401.00003", "cs.LG")]),
+    }
+    requests_seen = []
+
+    class Stub(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            requests_seen.append(params)
+            if len(requests_seen) == 1:
+                # Flow control in the HTTP-date form (already due, so the harvester doesn't sleep)
+                self.send_response(503)
+                self.send_header("Retry-After", format_datetime(datetime.now(timezone.utc), usegmt=True))
+                self.end_headers()
+                return
+            body = pages[params.get("resumptionToken", [""])[0]]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "cs_lg.jsonl.gz")
+            kwargs = {"base_url": f"http://127.0.0.1:{httpd.server_port}/oai2", "set_spec": "cs", "categories": ["cs.LG"]}
+            state = Harvester(out, **kwargs).run(max_pages=1)
+            assert state["token"] == "t1" and not state["done"] and state["records"] == 1, state
+            with open(out, "ab") as f:
+                f.write(b"half a page from a crashed run")
+            state = Harvester(out, **kwargs).run()  # a fresh process resuming from the checkpoint
+            assert state["done"] and state["pages"] == 2 and state["records"] == 2, state
+            assert [r["arxiv_id"] for r in read_harvest(out)] == ["2401.00001", "2401.00003"]
+    finally:
+        httpd.shutdown()
+    assert requests_seen[0] == requests_seen[1] == {"verb": ["ListRecords"], "metadataPrefix": ["arXiv"], "set": ["cs"]}
+    assert requests_seen[2] == {"verb": ["ListRecords"], "resumptionToken": ["t1"]}
+    print("OK")
+    print()
+
+def test_alerts_per_user():
+    """/alerts/new only shows the caller's own watches; a watch nobody holds any more is dropped"""
+    print("Testing per-user alerts...")
+    client = _offline_client()
+    from alerts_worker import alert_store
+    run = str(int(time.time() * 1000))
+    alice, bob = {"X-User-Id": f"alice-{run}"}, {"X-User-Id": f"bob-{run}"}
+    topic_a, topic_b = f"graphs {run}", f"quantum {run}"
+    client.post("/me/topics", json={"value": topic_a}, headers=alice)
+    client.post("/me/topics", json={"value": topic_b}, headers=bob)
+    client.post("/me/topics", json={"value": topic_b}, headers=alice)
+    alert_store.record("topic", topic_a, [{"id": f"http://arxiv.org/abs/{run}.1v1", "title": "A", "published": "2024"}])
+    alert_store.record("topic", topic_b, [{"id": f"http://arxiv.org/abs/{run}.2v1", "title": "B", "published": "2024"}])
+
+    assert client.get("/alerts/new").status_code == 401
+    bob_view = client.get("/alerts/new", headers=bob).json()
+    assert [e["title"] for e in bob_view["entries"]] == ["B"], bob_view
+    assert [w["query"] for w in bob_view["watches"]] == [topic_b]
+    assert sorted(e["title"] for e in client.get("/alerts/new", headers=alice).json()["entries"]) == ["A", "B"]
+
+    client.delete("/me/topics", params={"value": f" {topic_b} "}, headers=bob)  # stored stripped
+    assert topic_b not in client.get("/me", headers=bob).json()["topics"]
+    assert any(w["query"] == topic_b for w in alert_store.watches()), "alice still watches it"
+    client.delete("/me/topics", params={"value": topic_b}, headers=alice)
+    assert not any(w["query"] == topic_b for w in alert_store.watches())
+
+    topic_c = f"robots {run}"
+    assert client.post("/alerts/watch", json={"kind": "topic", "query": topic_c}).status_code == 401
+    assert client.post("/alerts/watch", json={"kind": "topic", "query": topic_c}, headers=bob).json()["added"]
+    assert topic_c in client.get("/me", headers=bob).json()["topics"]
+    client.delete("/me/topics", params={"value": topic_c}, headers=bob)
+    assert not any(w["query"] == topic_c for w in alert_store.watches())
+
+    import tempfile
+    from alerts_worker import AlertStore, sync_watches
+    from store import ShardedStore
+    with tempfile.TemporaryDirectory() as tmp:
+        alerts, users = AlertStore(os.path.join(tmp, "alerts.db")), ShardedStore(os.path.join(tmp, "store"), shards=2)
+        users.add_author("Ada Lovelace", "carol")
+        alerts.watch("topic", "orphan")  # e.g. left by an older, unscoped /alerts/watch
+        assert sync_watches(alerts, users) == 1
+        assert [(w["kind"], w["query"]) for w in alerts.watches()] == [("author", "Ada Lovelace")]
+    print("OK")
+    print()
+
+def test_chat_pdf_only_arxiv():
+    """/chat only fetches arXiv PDFs; any other `pdf` value is a 400 before a request goes out"""
+    print("Testing /chat pdf validation...")
+    client = _offline_client()
+    body = {"context": "An abstract.", "question": "What is it?"}
+    for pdf in ("http://169.254.169.254/latest/meta-data/", "file:///etc/passwd",
+                "https://arxiv.org.evil.com/pdf/2401.01234", "http://localhost:8000/health"):
+        r = client.post("/chat", json={**body, "pdf": pdf})
+        assert r.status_code == 400, (pdf, r.status_code, r.text)
+    from server import _arxiv_pdf_url
+    assert _arxiv_pdf_url("https://arxiv.org/abs/2401.01234v2") == "http://arxiv.org/pdf/2401.01234v2"
+    assert _arxiv_pdf_url("2401.01234") == "http://arxiv.org/pdf/2401.01234"
+    print("OK")
+    print()
+
+def test_chat_pdf_pending():
+    """/chat answers from the abstract, flagged `fulltext_pending`, when extraction is busy"""
+    print("Testing /chat with full text pending...")
+    client = _offline_client()
+    import server
+    from read_pdf import QueueFull
+
+    def busy(url, timeout=None, block=True):
+        assert timeout is not None and not block, (timeout, block)
+        raise QueueFull("256 extraction jobs pending")
+
+    server.extraction_pool.fulltext, saved = busy, server.extraction_pool.fulltext
+    try:
+        r = client.post("/chat", json={"context": "Attention is all you need.", "question": "What is needed?",
+                                       "pdf": "2401.01234"})
+    finally:
+        server.extraction_pool.fulltext = saved
+    assert r.status_code == 200, r.text
+    assert r.json().get("answer") and r.json().get("fulltext_pending") is True, r.json()
+    print("OK")
+    print()
+
+def test_fulltext_job_forgotten():
+    """A job evicted between submit and wait reads as "not ready", never as a 500"""
+    print("Testing forgotten full-text jobs...")
+    client = _offline_client()
+    import server
+    pool = server.extraction_pool
+    submitted = []
+
+    def submit(url, block=False):
+        submitted.append(url)
+        return {"url": url, "status": "queued"}
+
+    patched = {"cached": lambda url: None, "status": lambda url: None, "submit": submit,
+               "wait": lambda url, timeout=None: None}  # as after forget(0)
+    for name, fn in patched.items():
+        setattr(pool, name, fn)
+    try:
+        try:
+            pool.fulltext("http://arxiv.org/pdf/2401.01234", timeout=0.1)
+            raise AssertionError("expected TimeoutError")
+        except TimeoutError:
+            pass
+        submitted.clear()
+        r = client.get("/papers/2401.01234/fulltext", params={"wait": 1})
+        assert r.status_code == 202 and r.json()["status"] == "queued", r.text
+        assert len(submitted) == 2, submitted  # queued again once the first job was gone
+    finally:
+        for name in patched:
+            delattr(pool, name)  # back to the class methods
+    print("OK")
+    print()
+
+def test_extraction_pool_recovers():
+    """A killed extraction worker doesn't break the pool for good: the next PDF still extracts"""
+    print("Testing extraction pool recovery...")
+    import signal
+    import tempfile
+    import threading
+    from http.server import HTTPServer, SimpleHTTPRequestHandler
+    from bench import synthetic_pdf
+    from corpus import Corpus
+    from read_pdf import ExtractionPool, PdfCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        papers = os.path.join(tmp, "papers")
+        os.makedirs(papers)
+        for i in range(2):
+            synthetic_pdf(os.path.join(papers, f"{i}.pdf"), 2, seed=i)
+
+        class Quiet(SimpleHTTPRequestHandler):
+            def __init__(self, *a, **kw):
+                super().__init__(*a, directory=papers, **kw)
+
+            def log_message(self, *a):
+                pass
+
+        httpd = HTTPServer(("127.0.0.1", 0), Quiet)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{httpd.server_port}"
+        pool = ExtractionPool(workers=1, cache=PdfCache(os.path.join(tmp, "cache")),
+                              corpus=Corpus(os.path.join(tmp, "corpus")))
+        try:
+            assert pool.fulltext(f"{base}/0.pdf", timeout=60)["pages"] == 2
+            for proc in list(pool._executor()._processes.values()):
+                os.kill(proc.pid, signal.SIGKILL)  # as the OOM killer or a pypdf segfault would
+            assert pool.fulltext(f"{base}/1.pdf", timeout=60)["pages"] == 2
+            assert pool.stats()["restarts"] == 1, pool.stats()
+        finally:
+            pool.shutdown()
+            httpd.shutdown()
+    print("OK")
+    print()
+
+if __name__ == "__main__":
+    if "--load" in sys.argv:
+        sys.exit(0 if test_concurrent_users() else 1)
+    if "--offline" in sys.argv:
+        test_race_without_keys()
+        test_fallback_summary_cache_key()
+        test_query_encoding()
+        test_harvest_offline()
+        test_alerts_per_user()
+        test_chat_pdf_only_arxiv()
+        test_chat_pdf_pending()
+        test_fulltext_job_forgotten()
+        test_extraction_pool_recovers()
+        sys.exit(0)
+
+    # Test health endpoint
+    test_health()
+    
+    # Test search endpoint with different topics
+    test_search("machine learning", max_results=2)
+    test_search("quantum computing", max_results=2)
+    test_search("neural networks", max_results=2)